@@ -4,4 +4,115 @@ from dotenv import load_dotenv
 load_dotenv()
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-LLMWHISPERER_API_KEY = os.getenv("LLMWHISPERER_API_KEY")
\ No newline at end of file
+LLMWHISPERER_API_KEY = os.getenv("LLMWHISPERER_API_KEY")
+
+# PDF extraction cache (keyed by SHA-256 of the PDF bytes + extraction params)
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "1") == "1"
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", ".cache/extraction")
+EXTRACTION_CACHE_TTL = int(os.getenv("EXTRACTION_CACHE_TTL", str(30 * 24 * 3600)))
+EXTRACTION_CACHE_MAX_MB = int(os.getenv("EXTRACTION_CACHE_MAX_MB", "200"))
+
+# Local text-layer extraction first; escalate to LLMWhisperer when the text looks scanned/broken
+EXTRACTION_LOCAL_ENABLED = os.getenv("EXTRACTION_LOCAL_ENABLED", "1") == "1"
+EXTRACTION_MIN_CHARS = int(os.getenv("EXTRACTION_MIN_CHARS", "200"))
+EXTRACTION_MAX_GARBAGE_RATIO = float(os.getenv("EXTRACTION_MAX_GARBAGE_RATIO", "0.1"))
+
+# Request concurrency: blocking work runs in bounded executors, excess load gets a 503
+IO_WORKERS = int(os.getenv("IO_WORKERS", "16"))
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "4"))  # concurrent scorers feed the encode micro-batcher
+ANALYSIS_MAX_CONCURRENT = int(os.getenv("ANALYSIS_MAX_CONCURRENT", "4"))
+ANALYSIS_MAX_QUEUED = int(os.getenv("ANALYSIS_MAX_QUEUED", "16"))
+
+# Async analysis jobs
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_MAX = int(os.getenv("JOB_QUEUE_MAX", "64"))
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", "3600"))
+
+# Gemini generator orchestration: up to 3 concurrent section calls per in-flight analysis or job,
+# so every admitted analysis gets its stage-2 calls running instead of queued behind others
+LLM_MAX_WORKERS = int(os.getenv("LLM_MAX_WORKERS", str((ANALYSIS_MAX_CONCURRENT + JOB_WORKERS) * 3)))
+LLM_CALL_TIMEOUT = float(os.getenv("LLM_CALL_TIMEOUT", "45"))  # per call, measured from when it starts running
+
+# Embeddings / bulk ranking
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+RANK_MAX_RESUMES = int(os.getenv("RANK_MAX_RESUMES", "500"))
+
+# JD profile cache (KeyBERT phrases, JD tech skills, JD embedding) keyed by normalized JD text
+JD_CACHE_MAX_ENTRIES = int(os.getenv("JD_CACHE_MAX_ENTRIES", "256"))
+JD_CACHE_DIR = os.getenv("JD_CACHE_DIR", "")  # empty = memory only
+JD_CACHE_TTL = int(os.getenv("JD_CACHE_TTL", str(7 * 24 * 3600)))
+JD_CACHE_MAX_MB = int(os.getenv("JD_CACHE_MAX_MB", "50"))  # on-disk cap, least recently used evicted first
+
+# Gemini response cache (prompt-hash keyed) + in-flight de-duplication
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048"))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "")  # empty = memory only
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "100"))  # on-disk cap, least recently used evicted first
+
+# "multi" = five focused Gemini calls, "mega" = one structured call + targeted re-requests
+GENERATOR_MODE = os.getenv("GENERATOR_MODE", "multi")
+
+# Model lifecycle: loaded in the background at startup (or lazily on first use), served from a local dir
+SBERT_MODEL_NAME = os.getenv("SBERT_MODEL_NAME", "all-MiniLM-L6-v2")
+MODEL_DIR = os.getenv("MODEL_DIR", "models")
+MODEL_PRELOAD = os.getenv("MODEL_PRELOAD", "1") == "1"
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "1") == "1"
+
+# Sentence-embedding inference backend: torch | torch-int8 | onnx | onnx-int8
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+ONNX_QUANT_CONFIG = os.getenv("ONNX_QUANT_CONFIG", "avx2")  # arm64 | avx2 | avx512 | avx512_vnni
+
+# Shared inference pool: "" = load models in-process; "host:port" or a unix socket path = use the pool
+INFERENCE_POOL_ADDRESS = os.getenv("INFERENCE_POOL_ADDRESS", "")
+INFERENCE_POOL_AUTHKEY = os.getenv("INFERENCE_POOL_AUTHKEY", "")  # required, private: the pool unpickles what it receives
+INFERENCE_POOL_WORKERS = int(os.getenv("INFERENCE_POOL_WORKERS", "2"))
+INFERENCE_POOL_TORCH_THREADS = int(os.getenv("INFERENCE_POOL_TORCH_THREADS", "2"))
+INFERENCE_POOL_TIMEOUT = float(os.getenv("INFERENCE_POOL_TIMEOUT", "30"))
+INFERENCE_BATCH_MAX = int(os.getenv("INFERENCE_BATCH_MAX", "64"))
+INFERENCE_BATCH_WAIT_MS = float(os.getenv("INFERENCE_BATCH_WAIT_MS", "5"))
+
+# In-process micro-batching of encode calls from concurrent requests (uses the INFERENCE_BATCH_* knobs)
+EMBEDDING_MICROBATCH = os.getenv("EMBEDDING_MICROBATCH", "1") == "1"
+
+# Per-resume chunk embedding index (memory-mapped, normalized float32), keyed by resume-text hash.
+# NOTE: persists resume text (candidate PII) to CHUNK_INDEX_DIR; set CHUNK_INDEX_ENABLED=0 where that
+# is not acceptable, or point the directory at storage covered by your retention policy
+CHUNK_INDEX_ENABLED = os.getenv("CHUNK_INDEX_ENABLED", "1") == "1"
+CHUNK_INDEX_DIR = os.getenv("CHUNK_INDEX_DIR", ".cache/chunk_index")
+CHUNK_INDEX_MAX_MB = int(os.getenv("CHUNK_INDEX_MAX_MB", "500"))
+
+# Talent search: resume embeddings + skill inverted index, persisted append-only
+TALENT_INDEX_DIR = os.getenv("TALENT_INDEX_DIR", ".cache/talent_index")
+
+# Upstream providers: live | fake (local stand-in with simulated latency) | record | replay
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini")          # gemini | fake | record | replay
+OCR_PROVIDER = os.getenv("OCR_PROVIDER", "llmwhisperer")    # llmwhisperer | fake | record | replay
+PROVIDER_REPLAY_DIR = os.getenv("PROVIDER_REPLAY_DIR", ".cache/replay")
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "1500"))
+FAKE_OCR_LATENCY_MS = float(os.getenv("FAKE_OCR_LATENCY_MS", "3000"))
+FAKE_LATENCY_JITTER = float(os.getenv("FAKE_LATENCY_JITTER", "0.2"))    # +/- fraction of the mean
+FAKE_FAILURE_RATE = float(os.getenv("FAKE_FAILURE_RATE", "0"))          # share of fake calls that raise
+
+# Generator prompts: relevance-selected resume/JD excerpts within a token budget (~4 chars per token)
+PROMPT_EXCERPTS_ENABLED = os.getenv("PROMPT_EXCERPTS_ENABLED", "1") == "1"
+PROMPT_RESUME_TOKENS = int(os.getenv("PROMPT_RESUME_TOKENS", "600"))
+PROMPT_MEGA_RESUME_TOKENS = int(os.getenv("PROMPT_MEGA_RESUME_TOKENS", "900"))
+PROMPT_JD_TOKENS = int(os.getenv("PROMPT_JD_TOKENS", "300"))
+
+# Stream Gemini replies and parse them incrementally (early stop, local repair of truncated JSON)
+LLM_STREAMING = os.getenv("LLM_STREAMING", "1") == "1"
+
+# Upstream client layer (Gemini, LLMWhisperer): token-bucket rate limits sized to the API quota
+# (<= 0 = unlimited; only applied to live/record providers, never fake/replay), per-call deadlines,
+# exponential backoff with jitter, circuit breaker
+LLM_RATE_PER_MIN = float(os.getenv("LLM_RATE_PER_MIN", "300"))
+LLM_BURST = int(os.getenv("LLM_BURST", "20"))
+OCR_RATE_PER_MIN = float(os.getenv("OCR_RATE_PER_MIN", "60"))
+OCR_BURST = int(os.getenv("OCR_BURST", "5"))
+OCR_CALL_TIMEOUT = float(os.getenv("OCR_CALL_TIMEOUT", "120"))
+OCR_MAX_ATTEMPTS = int(os.getenv("OCR_MAX_ATTEMPTS", "2"))
+UPSTREAM_BACKOFF_BASE = float(os.getenv("UPSTREAM_BACKOFF_BASE", "0.5"))   # seconds, doubled per retry
+UPSTREAM_BACKOFF_MAX = float(os.getenv("UPSTREAM_BACKOFF_MAX", "8"))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))  # consecutive failures; <= 0 = never open
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "30"))   # seconds open before a probe call
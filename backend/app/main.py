@@ -1,9 +1,24 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+import json
+import time
+from typing import List, Optional
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
+from fastapi.responses import StreamingResponse, JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.services.extractor import extract_text_from_pdf
-from app.services.scoring import calculate_ats_analysis
-# CHANGE 1: Import 'build_ui_payload'
-from app.services.generator import run_all_and_normalize, build_ui_payload 
+from app.services.concurrency import analysis_gate, Overloaded, run_inference, run_io
+from app.services.pipeline import run_analysis, stream_analysis, run_ranking, ExtractionFailed
+from app.services.jobs import job_manager
+from app.services.jd_cache import jd_cache
+from app.services.extractor import extraction_cache
+from app.services.generator import llm_cache
+from app.services.prompt_builder import prompt_stats
+from app.services.json_stream import parse_stats
+from app.services.upstream import llm_upstream, ocr_upstream, upstream_status
+from app.services.scoring import chunk_index
+from app.services.talent_index import get_talent_index, loaded_talent_index
+from app.services.extractor import extract_pdf
+from app.services.ai_models import ai_loader
+from app.services.metrics import registry, http_request_seconds
+from app.config import RANK_MAX_RESUMES, MODEL_PRELOAD
 
 app = FastAPI()
 
@@ -15,34 +30,199 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    # Streaming responses are timed until the first byte; their stages still land in the stage histogram
+    t0 = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        http_request_seconds.observe(time.perf_counter() - t0, method=request.method,
+                                     route=getattr(route, "path", "unmatched"), status=status)
+
+# --- METRICS: cache / queue gauges read at scrape time ---
+for _name, _cache in (("jd_cache", jd_cache), ("llm_cache", llm_cache),
+                      ("extraction_cache", extraction_cache), ("chunk_index", chunk_index)):
+    if _cache is None: continue
+    registry.gauge(f"career_compass_{_name}_hits", f"{_name} hits since start.", lambda c=_cache: c.stats()["hits"])
+    registry.gauge(f"career_compass_{_name}_misses", f"{_name} misses since start.", lambda c=_cache: c.stats()["misses"])
+registry.gauge("career_compass_analyses_active", "Analyses holding an admission slot.", lambda: analysis_gate.active)
+registry.gauge("career_compass_analyses_waiting", "Analyses waiting for an admission slot.", lambda: analysis_gate.waiting)
+registry.gauge("career_compass_analyses_rejected", "Analyses rejected with 503 since start.", lambda: analysis_gate.rejected)
+registry.gauge("career_compass_jobs_queued", "Background analysis jobs waiting for a worker.", lambda: job_manager.stats()["queued"])
+for _name, _client in (("llm", llm_upstream), ("ocr", ocr_upstream)):
+    registry.gauge(f"career_compass_{_name}_circuit_open", f"1 while calls to the {_name} upstream are short-circuited.",
+                   lambda c=_client: int(not c.available()))
+    registry.gauge(f"career_compass_{_name}_upstream_failures", f"Failed {_name} upstream calls since start.",
+                   lambda c=_client: c.status()["failed"])
+
+@app.on_event("startup")
+async def startup():
+    job_manager.start()
+    if MODEL_PRELOAD:
+        # Load + warm up off the event loop; /ready reports progress
+        ai_loader.load_in_background()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await job_manager.stop()
+
+@app.get("/ready")
+async def ready():
+    status = ai_loader.status()
+    return JSONResponse(status_code=200 if ai_loader.is_ready else 503, content=status)
+
+def _resolve_jd(jd_text: Optional[str], jd_id: Optional[str]) -> str:
+    """Requests send either the JD text itself or the jd_id returned by POST /jd."""
+    if jd_id:
+        profile = jd_cache.lookup(jd_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired jd_id, register the JD again")
+        return profile["jd_text"]
+    if not jd_text:
+        raise HTTPException(status_code=422, detail="Either jd_text or jd_id is required")
+    return jd_text
+
+@app.post("/jd")
+async def register_jd(jd_text: str = Form(...)):
+    """Pre-compute and cache the JD profile; reference it later with jd_id."""
+    profile = await run_inference(jd_cache.get_profile, jd_text)
+    return {"jd_id": profile["jd_id"], "jd_phrases": profile["jd_phrases"], "jd_tech_flat": profile["jd_tech_flat"]}
+
 @app.post("/analyze")
-async def analyze(resume_file: UploadFile = File(...), jd_text: str = Form(...)):
+async def analyze(resume_file: UploadFile = File(...), jd_text: Optional[str] = Form(None),
+                  jd_id: Optional[str] = Form(None), include_timings: bool = Form(False)):
+    jd_text = _resolve_jd(jd_text, jd_id)
+    try:
+        async with analysis_gate:
+            pdf_bytes = await resume_file.read()
+            return await run_analysis(pdf_bytes, resume_file.filename, jd_text, include_timings=include_timings)
+
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except ExtractionFailed as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/analyze/stream")
+async def analyze_stream(resume_file: UploadFile = File(...), jd_text: Optional[str] = Form(None),
+                         jd_id: Optional[str] = Form(None), include_timings: bool = Form(False)):
+    """NDJSON stream: ATS scores as soon as they are computed, then each LLM section as it completes."""
+    jd_text = _resolve_jd(jd_text, jd_id)
+    pdf_bytes = await resume_file.read()
     try:
-        # 1. Extract
-        print("Extracting PDF...")
-        resume_text = extract_text_from_pdf(resume_file)
-        if not resume_text:
-            raise HTTPException(status_code=400, detail="Failed to extract text from PDF")
-        
-        # 2. Score (Math)
-        print("Scoring...")
-        ats_result = calculate_ats_analysis(resume_text, jd_text)
-        
-        # 3. Generate (LLM)
-        print("Generating Advice...")
-        llm_result_raw = run_all_and_normalize(resume_text, jd_text, ats_result["missing_skills"])
-        
-        # CHANGE 2: Convert raw LLM data to UI-friendly format
-        # This converts 'predicted_roles' -> 'roles' so the Frontend doesn't crash
-        llm_result_clean = build_ui_payload(llm_result_raw)
-        
-        # 4. Merge & Return
-        return {**ats_result, **llm_result_clean}
+        analysis_gate.check()  # reject with a real 503 while we still can
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+    async def body():
+        # The slot is taken and released inside the generator: a body that is never iterated
+        # (client gone before the first chunk) never holds one
+        try:
+            async with analysis_gate:
+                async for event in stream_analysis(pdf_bytes, resume_file.filename, jd_text, include_timings):
+                    yield json.dumps(event) + "\n"
+        except Overloaded as e:
+            yield json.dumps({"event": "error", "status": 503, "detail": str(e)}) + "\n"
 
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+@app.post("/rank")
+async def rank(resume_files: List[UploadFile] = File(...), jd_text: Optional[str] = Form(None),
+               jd_id: Optional[str] = Form(None)):
+    """Rank many resumes against one JD using only the deterministic ATS scores (no LLM calls)."""
+    if len(resume_files) > RANK_MAX_RESUMES:
+        raise HTTPException(status_code=413, detail=f"At most {RANK_MAX_RESUMES} resumes per request")
+    jd_text = _resolve_jd(jd_text, jd_id)
+    try:
+        async with analysis_gate:
+            files = []
+            for f in resume_files:
+                # Duplicate filenames would collide as ids
+                name = f.filename if f.filename not in {n for n, _ in files} else f"{f.filename}#{len(files)}"
+                files.append((name, await f.read()))
+            return await run_ranking(files, jd_text)
+
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         print(f"Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analyze/jobs", status_code=202)
+async def submit_analysis_job(resume_file: UploadFile = File(...), jd_text: Optional[str] = Form(None),
+                              jd_id: Optional[str] = Form(None), include_timings: bool = Form(False)):
+    jd_text = _resolve_jd(jd_text, jd_id)
+    try:
+        return job_manager.submit(await resume_file.read(), resume_file.filename, jd_text, include_timings)
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+@app.get("/analyze/jobs/{job_id}")
+async def get_analysis_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+@app.post("/talent/resumes")
+async def ingest_talent_resume(resume_file: UploadFile = File(...), candidate_id: Optional[str] = Form(None)):
+    """Store a resume's embedding and tech skills for later talent search."""
+    extraction = await run_io(extract_pdf, await resume_file.read(), resume_file.filename)
+    if not extraction["text"]:
+        raise HTTPException(status_code=400, detail="Failed to extract text from PDF")
+    index = await run_io(get_talent_index)
+    return await run_inference(index.ingest, candidate_id or resume_file.filename, extraction["text"],
+                               {"filename": resume_file.filename})
+
+@app.post("/talent/search")
+async def search_talent(jd_text: Optional[str] = Form(None), jd_id: Optional[str] = Form(None),
+                        required_skills: Optional[str] = Form(None), top_k: int = Form(20)):
+    """Best-matching stored resumes for a JD; `required_skills` is comma-separated and all must be present."""
+    jd_embedding = None
+    if jd_id:
+        profile = jd_cache.lookup(jd_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired jd_id, register the JD again")
+        jd_embedding, jd_text = profile.get("jd_embedding"), profile["jd_text"]
+    elif not jd_text:
+        raise HTTPException(status_code=422, detail="Either jd_text or jd_id is required")
+    skills = [s for s in (required_skills or "").split(",") if s.strip()]
+    index = await run_io(get_talent_index)
+    return await run_inference(index.search, jd_text, skills, top_k, jd_embedding)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition: stage / request latency histograms, LLM attempt outcomes, cache gauges."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/upstream/status")
+async def upstream():
+    """Circuit state, rate-limit level and call outcomes for Gemini and LLMWhisperer."""
+    return upstream_status()
+
+@app.get("/stats")
+async def stats():
+    return {
+        "admission": analysis_gate.stats(),
+        "jobs": job_manager.stats(),
+        "jd_cache": jd_cache.stats(),
+        "llm_cache": llm_cache.stats() if llm_cache else None,
+        "extraction_cache": extraction_cache.stats() if extraction_cache else None,
+        "chunk_index": chunk_index.stats() if chunk_index else None,
+        "embedding_batching": ai_loader.batching_stats() if ai_loader.is_ready else None,
+        "talent_index": index.stats() if (index := loaded_talent_index()) else None,  # None until first opened
+        "prompt_builder": prompt_stats.stats(),
+        "llm_parsing": parse_stats.stats(),
+        "upstream": upstream_status(),
+    }
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="127.0.0.1", port=8000)
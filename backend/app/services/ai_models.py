@@ -1,19 +1,204 @@
-from sentence_transformers import SentenceTransformer
-from keybert import KeyBERT
+import glob
+import os
+import threading
+import time
+import numpy as np
+from app.config import (
+    SBERT_MODEL_NAME, MODEL_DIR, MODEL_WARMUP, EMBEDDING_BACKEND, ONNX_QUANT_CONFIG, INFERENCE_POOL_ADDRESS,
+    EMBEDDING_MICROBATCH, EMBEDDING_BATCH_SIZE, INFERENCE_BATCH_MAX, INFERENCE_BATCH_WAIT_MS,
+)
+from app.services.batching import MicroBatcher
+
+WARMUP_TEXTS = [
+    "warmup",
+    "Built REST APIs in Python and deployed them with Docker on AWS.",
+    "We are looking for a backend engineer with experience in distributed systems, "
+    "message queues and cloud infrastructure to design and operate scalable services.",
+]
+
+EMBEDDING_BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+def local_model_path(model_name: str = SBERT_MODEL_NAME) -> str:
+    return os.path.join(MODEL_DIR, model_name)
+
+def build_sentence_model(backend: str = EMBEDDING_BACKEND, model_name: str = SBERT_MODEL_NAME):
+    """SentenceTransformer for the requested inference backend.
+
+    torch       full-precision PyTorch (reference)
+    torch-int8  PyTorch with dynamic int8 quantization of the Linear layers
+    onnx        ONNX Runtime export of the same weights
+    onnx-int8   ONNX Runtime, dynamically quantized for ONNX_QUANT_CONFIG
+    Exports are written next to the local model copy and reused on later boots.
+    """
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}', expected one of {EMBEDDING_BACKENDS}")
+    from sentence_transformers import SentenceTransformer
+
+    local = local_model_path(model_name)
+    if not os.path.isdir(local):
+        # First boot: download once, keep a local copy so later boots fetch nothing
+        SentenceTransformer(model_name).save(local)
+
+    if backend == "torch":
+        return SentenceTransformer(local)
+
+    if backend == "torch-int8":
+        import torch
+        model = SentenceTransformer(local, device="cpu")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    try:
+        import onnxruntime  # noqa: F401
+    except ImportError:
+        raise ImportError("EMBEDDING_BACKEND=onnx* needs `pip install optimum[onnxruntime]`")
+
+    if not os.path.exists(os.path.join(local, "onnx", "model.onnx")):
+        SentenceTransformer(local, backend="onnx").save(local)
+    if backend == "onnx":
+        return SentenceTransformer(local, backend="onnx", model_kwargs={"file_name": os.path.join("onnx", "model.onnx")})
+
+    def _quantized_file():
+        # Exporter names it model_qint8_<cfg>.onnx or model_quint8_<cfg>.onnx depending on the config
+        found = glob.glob(os.path.join(local, "onnx", f"model_*int8_{ONNX_QUANT_CONFIG}.onnx"))
+        return os.path.relpath(found[0], local) if found else None
+
+    if _quantized_file() is None:
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+        export_dynamic_quantized_onnx_model(SentenceTransformer(local, backend="onnx"), ONNX_QUANT_CONFIG, local)
+    return SentenceTransformer(local, backend="onnx", model_kwargs={"file_name": _quantized_file()})
+
+def keybert_embedder(encode_fn):
+    """KeyBERT backend that routes its document/candidate embeddings through `encode_fn`
+    (micro-batcher or inference pool) instead of calling the model directly."""
+    from keybert.backend import BaseEmbedder
+
+    class RoutedEmbedder(BaseEmbedder):
+        def embed(self, documents, verbose: bool = False) -> np.ndarray:
+            return encode_fn(list(documents))
+
+    return RoutedEmbedder()
 
 class AIModelLoader:
+    """Process-wide model registry. Nothing heavy happens at import: models load on
+    `load()` (background thread at startup) or on first attribute access, using the
+    embedding backend chosen by EMBEDDING_BACKEND."""
     _instance = None
 
     def __new__(cls):
         if cls._instance is None:
-            print("Loading AI Models... (This happens only once)")
             cls._instance = super(AIModelLoader, cls).__new__(cls)
-            # Load SBERT
-            cls._instance.sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
-            # Load KeyBERT
-            cls._instance.kw_model = KeyBERT(model=cls._instance.sentence_model)
-            print("Models Loaded.")
+            cls._instance._lock = threading.Lock()
+            cls._instance._sentence_model = None
+            cls._instance._kw_model = None
+            cls._instance.pool_client = None
+            cls._instance.batcher = None
+            cls._instance.state = "not_loaded"  # not_loaded -> loading -> warming_up -> ready | error
+            cls._instance.error = None
+            cls._instance.source = None
+            cls._instance.timings = {}
         return cls._instance
 
+    def load(self) -> None:
+        if self.state == "ready": return
+        with self._lock:
+            if self.state == "ready": return
+            try:
+                self.state = "loading"
+                print("Loading AI Models... (This happens only once)")
+                t0 = time.perf_counter()
+                from keybert import KeyBERT
+                from app.services.inference_pool import pool_client
+
+                if pool_client is not None:
+                    # Weights live in the shared inference pool; this process only holds a client
+                    self.source = f"pool:{INFERENCE_POOL_ADDRESS}"
+                    sentence_model = None
+                    kw_model = KeyBERT(model=keybert_embedder(pool_client.encode))
+                    self.pool_client = pool_client
+                elif EMBEDDING_MICROBATCH:
+                    self.source = local_model_path()
+                    sentence_model = build_sentence_model(EMBEDDING_BACKEND)
+                    self.batcher = MicroBatcher(
+                        lambda texts: sentence_model.encode(texts, batch_size=EMBEDDING_BATCH_SIZE),
+                        max_batch_size=INFERENCE_BATCH_MAX, max_wait_ms=INFERENCE_BATCH_WAIT_MS, name="embed-batcher",
+                    )
+                    kw_model = KeyBERT(model=keybert_embedder(self.batcher.encode))
+                else:
+                    self.source = local_model_path()
+                    sentence_model = build_sentence_model(EMBEDDING_BACKEND)
+                    kw_model = KeyBERT(model=sentence_model)
+                self.timings["load_s"] = round(time.perf_counter() - t0, 3)
+
+                if MODEL_WARMUP and sentence_model is not None:
+                    self.state = "warming_up"
+                    self._warmup(sentence_model, kw_model)
+
+                self._sentence_model, self._kw_model = sentence_model, kw_model
+                self.state = "ready"
+                self.error = None
+                print("Models Loaded.")
+            except Exception as e:
+                self.state = "error"
+                self.error = f"{type(e).__name__}: {e}"
+                print(f"Model Load Error: {self.error}")
+                raise
+
+    def _warmup(self, sentence_model, kw_model) -> None:
+        # First forward passes pay for allocator / kernel setup; do it before traffic arrives
+        t0 = time.perf_counter()
+        sentence_model.encode(WARMUP_TEXTS)
+        kw_model.extract_keywords(WARMUP_TEXTS[-1], keyphrase_ngram_range=(1, 2), stop_words="english", top_n=3)
+        self.timings["warmup_s"] = round(time.perf_counter() - t0, 3)
+
+    def load_in_background(self) -> threading.Thread:
+        def _target():
+            try:
+                self.load()
+            except Exception:
+                pass  # state/error already recorded for /ready
+        thread = threading.Thread(target=_target, name="model-loader", daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def is_ready(self) -> bool:
+        return self.state == "ready"
+
+    @property
+    def sentence_model(self):
+        if self._sentence_model is None: self.load()
+        if self._sentence_model is None:
+            raise RuntimeError("Sentence model is served by the inference pool; use ai_loader.encode()")
+        return self._sentence_model
+
+    def encode(self, texts, batch_size: int = 32) -> np.ndarray:
+        """Embeddings for `texts`, from the shared inference pool, the in-process micro-batcher
+        (merged with concurrent callers) or the local model directly."""
+        if not self.is_ready: self.load()
+        if self.pool_client is not None:
+            return self.pool_client.encode(texts)
+        if self.batcher is not None:
+            return self.batcher.encode(list(texts))
+        return np.asarray(self._sentence_model.encode(texts, batch_size=batch_size), dtype=np.float32)
+
+    @property
+    def kw_model(self):
+        if self._kw_model is None: self.load()
+        return self._kw_model
+
+    def batching_stats(self) -> dict:
+        if self.pool_client is not None:
+            try:
+                return {"mode": "pool", **self.pool_client.stats()}
+            except Exception as e:
+                return {"mode": "pool", "error": str(e)}
+        if self.batcher is not None:
+            return {"mode": "in_process", **self.batcher.stats()}
+        return {"mode": "off"}
+
+    def status(self) -> dict:
+        return {"state": self.state, "model": SBERT_MODEL_NAME, "backend": EMBEDDING_BACKEND, "source": self.source,
+                "timings": dict(self.timings), "error": self.error}
+
 # Global instance to import
-ai_loader = AIModelLoader()
\ No newline at end of file
+ai_loader = AIModelLoader()
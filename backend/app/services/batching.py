@@ -0,0 +1,98 @@
+# backend/app/services/batching.py
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Dict, Any
+
+import numpy as np
+
+
+class MicroBatcher:
+    """Merges concurrent encode requests into shared forward passes.
+
+    Callers `encode(texts)`; a dispatcher thread takes the first waiting request, keeps
+    collecting for up to `max_wait_ms` or until `max_batch_size` texts are queued, then runs
+    one `encode_fn(all_texts)` and hands each caller its own rows. `dispatchers` > 1 lets
+    several batches be in flight at once (e.g. one per inference worker process).
+    """
+
+    def __init__(self, encode_fn: Callable[[List[str]], np.ndarray], max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0, dispatchers: int = 1, name: str = "batcher"):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: "queue.Queue" = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self._threads = [
+            threading.Thread(target=self._dispatch_loop, name=f"{name}-{i}", daemon=True)
+            for i in range(dispatchers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        future: Future = Future()
+        if not texts:
+            future.set_result(np.zeros((0, 0), dtype=np.float32))
+            return future
+        self._queue.put((list(texts), future))
+        return future
+
+    def encode(self, texts: List[str], timeout: float = None) -> np.ndarray:
+        return self.submit(texts).result(timeout=timeout)
+
+    def _collect(self) -> List[tuple]:
+        batch = [self._queue.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            batch = self._collect()
+            all_texts = [t for texts, _ in batch for t in texts]
+            try:
+                emb = np.asarray(self.encode_fn(all_texts), dtype=np.float32)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            with self._stats_lock:
+                self.batches += 1
+                self.requests += len(batch)
+                self.texts += len(all_texts)
+            start = 0
+            for texts, future in batch:
+                future.set_result(emb[start:start + len(texts)])
+                start += len(texts)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            batches, requests, texts = self.batches, self.requests, self.texts
+        return {
+            "batches": batches,
+            "requests": requests,
+            "texts": texts,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "avg_requests_per_batch": round(requests / batches, 3) if batches else 0.0,
+            "avg_texts_per_batch": round(texts / batches, 3) if batches else 0.0,
+            # how full the batches are relative to max_batch_size
+            "occupancy": round(texts / (batches * self.max_batch_size), 4) if batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
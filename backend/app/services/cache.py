@@ -0,0 +1,182 @@
+# backend/app/services/cache.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def content_key(*parts) -> str:
+    """SHA-256 over raw bytes / strings / JSON-able params, in order."""
+    h = hashlib.sha256()
+    for p in parts:
+        if isinstance(p, bytes):
+            h.update(p)
+        elif isinstance(p, str):
+            h.update(p.encode("utf-8"))
+        else:
+            h.update(json.dumps(p, sort_keys=True).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU with a per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int = 0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            created, value = entry
+            if self.ttl_seconds and time.time() - created > self.ttl_seconds:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._data)}
+
+
+class DiskCache:
+    """JSON-file cache on local disk with TTL expiry and a total-size cap (least recently used evicted).
+
+    Each file's mtime is pinned to its creation time (the one age both `get` and eviction use)
+    and its atime records the last use, which orders LRU eviction. The directory is only scanned
+    when the running size estimate crosses `max_bytes`; eviction then goes down to 90% of it.
+    """
+
+    LOW_WATER = 0.9
+
+    def __init__(self, directory: str, ttl_seconds: int = 0, max_bytes: int = 0):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None  # estimated bytes on disk; None until the first scan
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _expired(self, created: float) -> bool:
+        return bool(self.ttl_seconds) and time.time() - created > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        created = entry.get("created", 0)
+        if self._expired(created):
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path, (time.time(), created))  # atime = last use; mtime stays the creation time
+        except OSError:
+            pass
+        self.hits += 1
+        return entry.get("value")
+
+    def set(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        created = time.time()
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"created": created, "value": value}, f)
+        os.utime(tmp, (created, created))
+        if self.max_bytes:
+            size = os.path.getsize(tmp)
+            try:
+                size -= os.path.getsize(path)  # overwriting an existing entry
+            except OSError:
+                pass
+        os.replace(tmp, path)
+        if self.max_bytes:
+            with self._lock:
+                if self._size is not None:
+                    self._size += size
+                needs_scan = self._size is None or self._size > self.max_bytes
+            if needs_scan:
+                self._evict()
+
+    def _remove(self, path: str) -> None:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size -= size
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries, total = [], 0
+            for name in os.listdir(self.directory):
+                if not name.endswith(".json"): continue
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if self._expired(st.st_mtime):
+                    self._unlink(path)
+                    continue
+                entries.append((st.st_atime, st.st_size, path))
+                total += st.st_size
+            if total > self.max_bytes:
+                entries.sort()
+                for _, size, path in entries:
+                    if total <= self.max_bytes * self.LOW_WATER: break
+                    self._unlink(path)
+                    total -= size
+            self._size = total  # re-synced with disk (other processes may share the directory)
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                self._remove(os.path.join(self.directory, name))
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,163 @@
+# backend/app/services/chunk_index.py
+
+import json
+import os
+import threading
+from typing import List, Tuple, Callable, Optional
+
+import numpy as np
+
+from app.config import SBERT_MODEL_NAME, EMBEDDING_BACKEND
+from app.services.cache import MemoryCache, content_key
+from app.services.embeddings import encode_texts, normalize_rows
+
+
+class ChunkSet:
+    """Chunks of one resume and their L2-normalized embeddings (rows), usually memory-mapped."""
+
+    def __init__(self, key: str, chunks: List[str], emb: np.ndarray):
+        self.key = key
+        self.chunks = chunks
+        self.emb = emb
+
+    def search(self, query_emb: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k chunks per query row by dot product (= cosine, both sides normalized).
+
+        Returns (indices, similarities), each shaped (n_queries, k), best first.
+        """
+        sims = normalize_rows(query_emb) @ self.emb.T
+        k = min(k, sims.shape[1])
+        if k == 1:
+            idx = np.argmax(sims, axis=1)[:, None]
+        else:
+            idx = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            order = np.argsort(-np.take_along_axis(sims, idx, axis=1), axis=1)
+            idx = np.take_along_axis(idx, order, axis=1)
+        return idx, np.take_along_axis(sims, idx, axis=1)
+
+
+class ResumeChunkIndex:
+    """Persistent store of resume chunk embeddings; repeat analyses of a resume skip encoding.
+
+    Each resume is two files: <key>.npy (float32 matrix, opened with mmap) and <key>.json (chunks).
+    The chunks are resume text, so the directory holds candidate PII.
+    The key covers the model and backend, so switching either never reuses stale vectors.
+    With `max_bytes`, the least recently used resumes are evicted down to LOW_WATER of it.
+    """
+
+    LOW_WATER = 0.9
+
+    def __init__(self, directory: str, max_bytes: int = 0, chunker: Optional[Callable[[str], List[str]]] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.chunker = chunker
+        self.hits = 0
+        self.misses = 0
+        self._loaded = MemoryCache(max_entries=256)
+        self._size: Optional[int] = None  # estimated bytes on disk; None until the first scan
+        self._lock = threading.Lock()
+
+    def key(self, resume_text: str) -> str:
+        return content_key(SBERT_MODEL_NAME, EMBEDDING_BACKEND, resume_text)
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, key)
+        return f"{base}.npy", f"{base}.json"
+
+    def contains(self, resume_text: str) -> bool:
+        key = self.key(resume_text)
+        return self._loaded.get(key) is not None or os.path.exists(self._paths(key)[1])
+
+    def get(self, resume_text: str) -> ChunkSet:
+        key = self.key(resume_text)
+        entry = self._loaded.get(key)
+        if entry is None:
+            entry = self._load(key)
+        if entry is not None:
+            self._touch(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        chunks = self.chunker(resume_text)
+        emb = normalize_rows(encode_texts(chunks)) if chunks else np.zeros((0, 0), dtype=np.float32)
+        entry = ChunkSet(key, chunks, emb)
+        if chunks:
+            self._save(entry)
+        self._loaded.set(key, entry)
+        return entry
+
+    def _load(self, key: str) -> Optional[ChunkSet]:
+        npy_path, json_path = self._paths(key)
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                chunks = json.load(f)["chunks"]
+            emb = np.load(npy_path, mmap_mode="r")
+        except (OSError, ValueError, KeyError):
+            return None
+        entry = ChunkSet(key, chunks, emb)
+        self._loaded.set(key, entry)
+        return entry
+
+    def _save(self, entry: ChunkSet) -> None:
+        os.makedirs(self.directory, exist_ok=True)  # on first write, not at import
+        npy_path, json_path = self._paths(entry.key)
+        size = -self._entry_size(npy_path, json_path)  # overwriting an entry another caller just saved
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(npy_path + suffix, "wb") as f:
+            np.save(f, np.ascontiguousarray(entry.emb, dtype=np.float32))
+        os.replace(npy_path + suffix, npy_path)
+        with open(json_path + suffix, "w", encoding="utf-8") as f:
+            json.dump({"chunks": entry.chunks, "model": SBERT_MODEL_NAME, "backend": EMBEDDING_BACKEND}, f)
+        os.replace(json_path + suffix, json_path)  # json last: its presence marks a complete entry
+        if self.max_bytes:
+            size += self._entry_size(npy_path, json_path)
+            with self._lock:
+                if self._size is not None:
+                    self._size += size
+                needs_scan = self._size is None or self._size > self.max_bytes
+            if needs_scan:
+                self._evict()
+
+    def _touch(self, key: str) -> None:
+        """Mark a resume as recently used (json mtime), for eviction; memory hits count too."""
+        if not self.max_bytes: return
+        try:
+            os.utime(self._paths(key)[1])
+        except OSError:
+            pass
+
+    @staticmethod
+    def _entry_size(npy_path: str, json_path: str) -> int:
+        try:
+            return os.path.getsize(json_path) + os.path.getsize(npy_path)
+        except OSError:
+            return 0
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries, total = [], 0
+            for name in os.listdir(self.directory):
+                if not name.endswith(".json"): continue
+                json_path = os.path.join(self.directory, name)
+                npy_path = json_path[:-5] + ".npy"
+                try:
+                    size = os.path.getsize(json_path) + os.path.getsize(npy_path)
+                    entries.append((os.path.getmtime(json_path), size, json_path, npy_path))
+                except OSError:
+                    continue
+                total += size
+            if total > self.max_bytes:
+                entries.sort()
+                for _, size, json_path, npy_path in entries:
+                    if total <= self.max_bytes * self.LOW_WATER: break
+                    for path in (json_path, npy_path):
+                        try:
+                            os.remove(path)
+                        except OSError:
+                            pass
+                    total -= size
+            self._size = total  # re-synced with disk (other processes may share the directory)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "directory": self.directory}
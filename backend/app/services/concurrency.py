@@ -0,0 +1,72 @@
+# backend/app/services/concurrency.py
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.config import IO_WORKERS, INFERENCE_WORKERS, ANALYSIS_MAX_CONCURRENT, ANALYSIS_MAX_QUEUED
+
+# Network / disk bound work (OCR, Gemini orchestration)
+io_executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="io")
+# Model inference (SBERT / KeyBERT); torch releases the GIL inside its kernels
+inference_executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+
+
+class Overloaded(Exception):
+    """Raised when the admission queue is full; mapped to HTTP 503."""
+
+
+class AdmissionGate:
+    """Caps in-flight analyses and the number allowed to wait for a slot; beyond that, reject fast."""
+
+    def __init__(self, max_concurrent: int, max_queued: int):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self._sem = asyncio.Semaphore(max_concurrent)
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    def check(self) -> None:
+        """Raise Overloaded if a new analysis would be rejected right now (takes no slot)."""
+        if self.waiting >= self.max_queued and self.active >= self.max_concurrent:
+            self.rejected += 1
+            raise Overloaded("Server is at capacity, retry shortly")
+
+    async def __aenter__(self):
+        self.check()
+        self.waiting += 1
+        try:
+            await self._sem.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        self.active -= 1
+        self._sem.release()
+        return False
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active, "waiting": self.waiting, "rejected": self.rejected,
+            "max_concurrent": self.max_concurrent, "max_queued": self.max_queued,
+        }
+
+
+analysis_gate = AdmissionGate(ANALYSIS_MAX_CONCURRENT, ANALYSIS_MAX_QUEUED)
+
+
+# Both run `fn` in a copy of the caller's context so request-scoped contextvars (timing spans) follow it
+async def run_io(fn: Callable, *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(io_executor, functools.partial(ctx.run, fn, *args, **kwargs))
+
+async def run_inference(fn: Callable, *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(inference_executor, functools.partial(ctx.run, fn, *args, **kwargs))
@@ -0,0 +1,84 @@
+# backend/app/services/embeddings.py
+
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.config import EMBEDDING_BATCH_SIZE
+from app.services.ai_models import ai_loader
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def normalize_rows(mat) -> np.ndarray:
+    mat = np.asarray(mat, dtype=np.float32)
+    if mat.ndim == 1: mat = mat.reshape(1, -1)
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+def _model_encode(texts: List[str]) -> np.ndarray:
+    return ai_loader.encode(texts, batch_size=EMBEDDING_BATCH_SIZE)
+
+
+class EmbeddingCache:
+    """Text-hash keyed embedding store. Only texts not seen before reach the model."""
+
+    def __init__(self):
+        self._store: Dict[str, np.ndarray] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        keys = [text_key(t) for t in texts]
+        todo, seen = [], set()
+        for k, t in zip(keys, texts):
+            if k in self._store or k in seen:
+                self.hits += 1
+            else:
+                self.misses += 1
+                seen.add(k)
+                todo.append((k, t))
+
+        if todo:
+            vecs = _model_encode([t for _, t in todo])
+            for (k, _), v in zip(todo, vecs):
+                self._store[k] = v
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([self._store[k] for k in keys])
+
+    def put(self, text: str, vec) -> None:
+        """Seed a precomputed embedding (e.g. a cached JD profile) so it is never re-encoded."""
+        self._store.setdefault(text_key(text), np.asarray(vec, dtype=np.float32))
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._store)}
+
+
+_current_cache: ContextVar[Optional[EmbeddingCache]] = ContextVar("embedding_cache", default=None)
+
+@contextmanager
+def embedding_context():
+    """Share one EmbeddingCache across every encode in the enclosed block (one analysis)."""
+    existing = _current_cache.get()
+    if existing is not None:
+        yield existing
+        return
+    cache = EmbeddingCache()
+    token = _current_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _current_cache.reset(token)
+
+def encode_texts(texts: List[str]) -> np.ndarray:
+    """Encode through the active embedding context, or straight to the model outside one."""
+    cache = _current_cache.get()
+    if cache is not None:
+        return cache.encode(texts)
+    return _model_encode(texts)
@@ -1,29 +1,154 @@
-import os
-import shutil
-from unstract.llmwhisperer import LLMWhispererClientV2
-from app.config import LLMWHISPERER_API_KEY
-
-client = LLMWhispererClientV2(api_key=LLMWHISPERER_API_KEY)
-
-def extract_text_from_pdf(upload_file) -> str:
-    # 1. Save the upload temporarily
-    temp_path = f"temp_{upload_file.filename}"
-    with open(temp_path, "wb") as buffer:
-        shutil.copyfileobj(upload_file.file, buffer)
-    
-    try:
-        # 2. Call LLMWhisperer
-        res = client.whisper(
-            file_path=temp_path,
-            mode="high_quality",
-            wait_for_completion=True,
-            horizontal_stretch_factor="1.05"
-        )
-        return res["extraction"]["result_text"]
-    except Exception as e:
-        print(f"Extraction Error: {e}")
-        return ""
-    finally:
-        # 3. Cleanup
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
\ No newline at end of file
+import io
+import time
+from typing import Optional, Dict, Any, List
+from app.config import (
+    EXTRACTION_CACHE_ENABLED, EXTRACTION_CACHE_DIR,
+    EXTRACTION_CACHE_TTL, EXTRACTION_CACHE_MAX_MB,
+    EXTRACTION_LOCAL_ENABLED, EXTRACTION_MIN_CHARS, EXTRACTION_MAX_GARBAGE_RATIO, OCR_MAX_ATTEMPTS,
+)
+from app.services.cache import DiskCache, content_key
+from app.services.metrics import span
+from app.services.providers import OCRProvider, LLMWhispererProvider, get_ocr_provider, WHISPER_PARAMS
+from app.services.upstream import ocr_upstream
+
+extraction_cache = DiskCache(
+    EXTRACTION_CACHE_DIR,
+    ttl_seconds=EXTRACTION_CACHE_TTL,
+    max_bytes=EXTRACTION_CACHE_MAX_MB * 1024 * 1024,
+) if EXTRACTION_CACHE_ENABLED else None
+
+# --- QUALITY HEURISTICS ---
+def _garbage_ratio(text: str) -> float:
+    """Share of non-whitespace chars that look like a broken text layer (glyph ids, control/private-use chars)."""
+    chars = [c for c in text if not c.isspace()]
+    if not chars: return 1.0
+    bad = text.count("(cid:") * 5  # pdfminer-style unmapped glyph markers
+    for c in chars:
+        if c == "\ufffd" or (not c.isprintable()) or 0xE000 <= ord(c) <= 0xF8FF:
+            bad += 1
+    return min(bad / len(chars), 1.0)
+
+def is_usable_text(text: str, min_chars: int = EXTRACTION_MIN_CHARS,
+                   max_garbage_ratio: float = EXTRACTION_MAX_GARBAGE_RATIO) -> bool:
+    stripped = (text or "").strip()
+    if len(stripped) < min_chars: return False
+    return _garbage_ratio(stripped) <= max_garbage_ratio
+
+# --- BACKENDS ---
+class ExtractorBackend:
+    """A PDF -> text tier. `extract` returns "" when it cannot produce text."""
+    name = "base"
+
+    def extract(self, pdf_bytes: bytes, filename: str) -> str:
+        raise NotImplementedError
+
+class LocalTextLayerBackend(ExtractorBackend):
+    """Reads the embedded text layer with pypdf; milliseconds, no network."""
+    name = "local_text_layer"
+
+    def extract(self, pdf_bytes: bytes, filename: str) -> str:
+        if not pdf_bytes.startswith(b"%PDF-"):
+            return ""
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            return ""
+        try:
+            reader = PdfReader(io.BytesIO(pdf_bytes))
+            pages = [(page.extract_text() or "") for page in reader.pages]
+            return "\n".join(pages).strip()
+        except Exception as e:
+            print(f"Local Extraction Error: {e}")
+            return ""
+
+class LLMWhispererBackend(ExtractorBackend):
+    """Remote OCR (LLMWhisperer or the OCR_PROVIDER stand-in), fronted by the on-disk result cache."""
+    name = "llmwhisperer"
+
+    def __init__(self, whisper_client=None, cache: Optional[DiskCache] = extraction_cache,
+                 provider: Optional[OCRProvider] = None):
+        if provider is None and whisper_client is not None:
+            provider = LLMWhispererProvider(whisper_client)  # an explicit client is always the live API
+        self.provider = provider
+        self.cache = cache
+        self.last_cached = False
+
+    def _whisper(self, pdf_bytes: bytes, filename: str) -> str:
+        # Rate-limited, bounded by OCR_CALL_TIMEOUT, retried with backoff, skipped while the circuit is open
+        try:
+            provider = self.provider or get_ocr_provider()
+            return ocr_upstream.call(provider.extract, pdf_bytes, filename, attempts=OCR_MAX_ATTEMPTS)
+        except Exception as e:
+            print(f"Extraction Error: {e}")
+            return ""
+
+    def extract(self, pdf_bytes: bytes, filename: str) -> str:
+        self.last_cached = False
+        namespace = (self.provider or get_ocr_provider()).cache_namespace
+        # fake output is cached apart from real OCR results; live/record/replay share the original key
+        key = content_key(namespace, pdf_bytes, WHISPER_PARAMS) if namespace else content_key(pdf_bytes, WHISPER_PARAMS)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.last_cached = True
+                return cached
+
+        text = self._whisper(pdf_bytes, filename)
+        if text and self.cache is not None:
+            self.cache.set(key, text)
+        return text
+
+def default_backends(whisper_client=None) -> List[ExtractorBackend]:
+    backends = [LocalTextLayerBackend()] if EXTRACTION_LOCAL_ENABLED else []
+    backends.append(LLMWhispererBackend(whisper_client))
+    return backends
+
+# --- ENTRY POINTS ---
+def extract_pdf(pdf_bytes: bytes, filename: str = "resume.pdf",
+                backends: Optional[List[ExtractorBackend]] = None) -> Dict[str, Any]:
+    """Try each tier in order; escalate while the text fails the quality check.
+
+    The last tier's output is accepted as long as it is non-empty. If it comes back empty (e.g.
+    OCR down), the best non-empty earlier candidate is returned with quality "low" rather than
+    failing the request.
+    Returns {"text", "backend", "elapsed_ms", "cached", "attempts", "quality"}.
+    """
+    backends = backends if backends is not None else default_backends()
+    attempts = []
+    text, used, cached, quality = "", None, False, "ok"
+    best = None  # (usable chars, text, backend name) of rejected candidates
+    for i, backend in enumerate(backends):
+        t0 = time.perf_counter()
+        with span(f"extract.{backend.name}"):
+            candidate = backend.extract(pdf_bytes, filename)
+        elapsed = round((time.perf_counter() - t0) * 1000, 1)
+        is_last = i == len(backends) - 1
+        ok = bool(candidate.strip()) if is_last else is_usable_text(candidate)
+        attempts.append({"backend": backend.name, "elapsed_ms": elapsed, "chars": len(candidate), "accepted": ok})
+        if ok:
+            text, used = candidate, backend.name
+            cached = getattr(backend, "last_cached", False)
+            break
+        if candidate.strip():
+            score = len(candidate.strip()) * (1 - _garbage_ratio(candidate.strip()))
+            if best is None or score > best[0]:
+                best = (score, candidate, backend.name)
+
+    if not text and best is not None:
+        _, text, used = best
+        quality = "low"
+
+    return {
+        "text": text,
+        "backend": used,
+        "elapsed_ms": round(sum(a["elapsed_ms"] for a in attempts), 1),
+        "cached": cached,
+        "attempts": attempts,
+        "quality": quality,
+    }
+
+def extract_text_from_bytes(pdf_bytes: bytes, filename: str = "resume.pdf", whisper_client=None) -> str:
+    return extract_pdf(pdf_bytes, filename, default_backends(whisper_client))["text"]
+
+def extract_text_from_pdf(upload_file, whisper_client=None) -> str:
+    return extract_text_from_bytes(upload_file.file.read(), upload_file.filename, whisper_client=whisper_client)
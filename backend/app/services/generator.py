@@ -2,66 +2,206 @@
 
 import json
 import time
-import re  # Added for better cleaning
-import google.generativeai as genai
-from typing import Dict, Any, List, Optional, Tuple
-from app.config import GOOGLE_API_KEY
+import threading
+import contextvars
+from contextvars import ContextVar
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, List, Optional, Tuple, Callable, Sequence
+from app.config import (
+    LLM_MAX_WORKERS, LLM_STREAMING, LLM_CALL_TIMEOUT, GENERATOR_MODE,
+    LLM_CACHE_ENABLED, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL, LLM_CACHE_DIR, LLM_CACHE_MAX_MB,
+    PROMPT_RESUME_TOKENS, PROMPT_MEGA_RESUME_TOKENS, PROMPT_JD_TOKENS,
+)
+from app.services.cache import MemoryCache, DiskCache, content_key
+from app.services.metrics import span, llm_attempts
+from app.services.providers import get_llm_provider, LLM_MODEL_NAME
+from app.services.prompt_builder import resume_excerpt, jd_excerpt
+from app.services.scoring import extract_tech_keywords, flatten_skills
+from app.services.embeddings import embedding_context
+from app.services.json_stream import StreamingJSONParser, parse_json_text, parse_stats
+from app.services.upstream import llm_upstream, CircuitOpen, DeadlineExceeded
 
 # --- SETUP ---
-genai.configure(api_key=GOOGLE_API_KEY)
-llm_model = genai.GenerativeModel('gemini-2.5-flash')
+# Generator calls are blocking network I/O, so threads are enough to overlap them
+llm_executor = ThreadPoolExecutor(max_workers=LLM_MAX_WORKERS, thread_name_prefix="llm")
 
 # --- HELPERS ---
-def get_raw_llm_response(prompt):
-    response = llm_model.generate_content(prompt)
-    return response.text
-
-def _clean_json_text(text: str) -> str:
-    """Removes markdown code blocks and whitespace."""
-    # Remove ```json and ```
-    text = re.sub(r"```json\s*", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"```", "", text)
-    return text.strip()
-
-def _safe_json_loads(text: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
-    # 1. Clean Markdown
-    cleaned_text = _clean_json_text(text)
-    
-    # 2. Try Direct Parse
+def get_raw_llm_response(prompt, timeout=None):
+    # Gemini, or the fake / record / replay stand-in selected by LLM_PROVIDER
+    return get_llm_provider().generate(prompt, timeout)
+
+def get_llm_stream(prompt, timeout=None):
+    return get_llm_provider().generate_stream(prompt, timeout)
+
+# Receives (section key, item) for each array item as it streams in; set per section thread
+ItemCallback = Callable[[str, Any], None]
+_item_sink: ContextVar[Optional[ItemCallback]] = ContextVar("llm_item_sink", default=None)
+
+def _generate_parsed(prompt: str, required_keys: Sequence[str] = (), timeout: Optional[float] = None) -> Tuple[Optional[Dict], str, str]:
+    """One upstream attempt -> (parsed, raw, outcome). Streams when enabled: items are handed to
+    the section's item sink as they complete, and reading stops once `required_keys` are closed.
+    Truncated / fenced replies are repaired locally (outcome "repaired")."""
+    if not LLM_STREAMING:
+        raw = get_raw_llm_response(prompt, timeout).strip()
+        parsed, outcome = parse_json_text(raw)
+        parse_stats.record(outcome)
+        return parsed, raw, outcome
+
+    parser = StreamingJSONParser()
+    sink = _item_sink.get()
+    stream = get_llm_stream(prompt, timeout)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    early = False
     try:
-        return json.loads(cleaned_text), None
-    except:
-        pass
-
-    # 3. Try finding outer braces
-    start = cleaned_text.find("{")
-    end = cleaned_text.rfind("}")
-    if start != -1 and end != -1:
-        try:
-            return json.loads(cleaned_text[start:end+1]), None
-        except:
-            pass
-            
-    return None, text
+        for piece in stream:
+            if deadline is not None and time.monotonic() > deadline:
+                raise DeadlineExceeded("LLM stream outlived its deadline")
+            for key, item in parser.feed(piece):
+                if sink:
+                    try:
+                        sink(key, item)
+                    except Exception as e:
+                        print(f"on_item callback failed for '{key}': {e}")
+            if parser.done: break
+            if required_keys and parser.has_keys(required_keys):
+                early = True
+                break
+    finally:
+        close = getattr(stream, "close", None)
+        if close: close()
+    parsed, outcome = parser.result()
+    if early and outcome == "repaired":
+        outcome = "ok"  # we stopped reading on purpose; only the unread tail was closed off
+    parse_stats.record(outcome, early_stop=early, items=parser.items)
+    return parsed, parser.buf.strip(), outcome
 
-def _call_llm_with_retry(prompt: str, retries: int = 2) -> Tuple[Optional[Dict], str]:
+def _drop_incomplete(parsed: Dict) -> Dict:
+    """After a repair the last item of a section may be cut short; keep only renderable items."""
+    for key, required in SECTION_REQUIRED_KEYS.items():
+        items = parsed.get(key)
+        if isinstance(items, list):
+            parsed[key] = [it for it in items if isinstance(it, dict) and all(it.get(k) not in (None, "") for k in required)]
+    return parsed
+
+def _call_llm_uncached(prompt: str, retries: int = 2, required_keys: Sequence[str] = ()) -> Tuple[Optional[Dict], str]:
+    """Attempts share one LLM_CALL_TIMEOUT deadline; each goes through the rate limiter and circuit
+    breaker, and retries back off exponentially with jitter. An open circuit gives up at once."""
     last_raw = ""
-    for _ in range(retries + 1):
+    deadline = llm_upstream.deadline()
+    for attempt in range(retries + 1):
         try:
-            raw = get_raw_llm_response(prompt)
-            last_raw = raw.strip()
-            parsed, _ = _safe_json_loads(last_raw)
-            if parsed: return parsed, last_raw
-            time.sleep(1)
+            with span("llm.attempt" if attempt == 0 else "llm.retry"):
+                with llm_upstream.attempt(deadline) as remaining:
+                    parsed, last_raw, outcome = _generate_parsed(prompt, required_keys, remaining)
+            if parsed and outcome == "repaired":
+                parsed = _drop_incomplete(parsed)
+            if parsed:
+                llm_attempts.inc(outcome=outcome)
+                return parsed, last_raw
+            llm_attempts.inc(outcome="invalid_json")
+        except CircuitOpen:
+            llm_attempts.inc(outcome="circuit_open")
+            break
         except Exception as e:
-            print(f"LLM Error: {e}")
+            llm_attempts.inc(outcome="error")
+            print(f"LLM Error: {type(e).__name__}: {e}")
+        if attempt < retries and not llm_upstream.backoff(attempt, deadline):
+            break
     return None, last_raw
 
+# --- RESPONSE CACHE ---
+class LLMResponseCache:
+    """Prompt-hash keyed cache of parsed LLM responses.
+
+    Memory LRU with TTL, optionally backed by disk; concurrent identical prompts
+    share one upstream call instead of each paying a round trip.
+    """
+
+    def __init__(self, memory: MemoryCache, disk: Optional[DiskCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+        self.dedup_joins = 0
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: str) -> Optional[Tuple[Dict, str]]:
+        entry = self.memory.get(key)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.memory.set(key, entry)
+        return (entry["parsed"], entry["raw"]) if entry else None
+
+    def call(self, prompt: str, retries: int = 2, required_keys: Sequence[str] = ()) -> Tuple[Optional[Dict], str]:
+        namespace = get_llm_provider().cache_namespace  # fake responses never share keys with real ones
+        key = content_key(LLM_MODEL_NAME, namespace, prompt) if namespace else content_key(LLM_MODEL_NAME, prompt)
+        cached = self._lookup(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        with self._lock:
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._inflight[key] = Future()
+        if not owner:
+            self.dedup_joins += 1
+            return pending.result()
+
+        try:
+            # An identical call may have finished between our lookup and taking ownership
+            cached = self._lookup(key)
+            if cached is not None:
+                self.hits += 1
+                pending.set_result(cached)
+                return cached
+
+            self.misses += 1
+            parsed, raw = _call_llm_uncached(prompt, retries, required_keys)
+            if parsed:  # never cache failures
+                entry = {"parsed": parsed, "raw": raw}
+                self.memory.set(key, entry)
+                if self.disk is not None:
+                    self.disk.set(key, entry)
+            pending.set_result((parsed, raw))
+            return parsed, raw
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.dedup_joins
+        return {
+            "hits": self.hits, "misses": self.misses, "dedup_joins": self.dedup_joins,
+            "hit_rate": round((self.hits + self.dedup_joins) / lookups, 4) if lookups else 0.0,
+            "entries": len(self.memory), "persistent": self.disk is not None,
+        }
+
+
+llm_cache = LLMResponseCache(
+    MemoryCache(LLM_CACHE_MAX_ENTRIES, ttl_seconds=LLM_CACHE_TTL),
+    DiskCache(LLM_CACHE_DIR, ttl_seconds=LLM_CACHE_TTL, max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024)
+    if LLM_CACHE_DIR else None,
+) if LLM_CACHE_ENABLED else None
+
+def _call_llm_with_retry(prompt: str, retries: int = 2, required_keys: Sequence[str] = ()) -> Tuple[Optional[Dict], str]:
+    if llm_cache is None:
+        return _call_llm_uncached(prompt, retries, required_keys)
+    return llm_cache.call(prompt, retries, required_keys)
+
 # --- CORE GENERATORS ---
 def predict_roles_llm(resume_text: str, jd_text: str = None) -> Dict:
+    # Excerpt biased towards the lines that carry the candidate's tech skills
+    resume_ctx = resume_excerpt(resume_text, flatten_skills(extract_tech_keywords(resume_text)), PROMPT_RESUME_TOKENS, 4000)
     prompt = f"""
     CONTEXT:
-    RESUME: {resume_text[:4000]}
+    RESUME: {resume_ctx}
     
     TASK: Output top 3 predicted roles for this candidate. The reason should be in 1-2 lines.
     RETURN JSON ONLY:
@@ -71,7 +211,7 @@ def predict_roles_llm(resume_text: str, jd_text: str = None) -> Dict:
       ]
     }}
     """
-    parsed, raw = _call_llm_with_retry(prompt)
+    parsed, raw = _call_llm_with_retry(prompt, required_keys=("predicted_roles",))
     return {"predicted_roles": parsed.get("predicted_roles", []) if parsed else [], "raw": raw}
 
 def estimate_skill_levels_llm(resume_text: str, skills: List[str]) -> Dict:
@@ -80,7 +220,7 @@ def estimate_skill_levels_llm(resume_text: str, skills: List[str]) -> Dict:
         skills = ["Communication", "Problem Solving", "Technical Skills"]
 
     prompt = f"""
-    RESUME: {resume_text[:3000]}
+    RESUME: {resume_excerpt(resume_text, skills, PROMPT_RESUME_TOKENS, 3000)}
     SKILLS: {json.dumps(skills)}
     TASK: Estimate level (Beginner/Intermediate/Expert) for each skill based on resume.
     RETURN JSON ONLY:
@@ -90,7 +230,7 @@ def estimate_skill_levels_llm(resume_text: str, skills: List[str]) -> Dict:
       ]
     }}
     """
-    parsed, raw = _call_llm_with_retry(prompt)
+    parsed, raw = _call_llm_with_retry(prompt, required_keys=("skill_levels",))
     return {"skill_levels": parsed.get("skill_levels", []) if parsed else [], "raw": raw}
 
 def generate_booster_snippets_llm(resume_text: str, jd_text: str, missing_skills: List[str]) -> Dict:
@@ -101,8 +241,8 @@ def generate_booster_snippets_llm(resume_text: str, jd_text: str, missing_skills
         is_generic = True
 
     prompt = f"""
-    RESUME: {resume_text[:3000]}
-    JD: {jd_text[:2000]}
+    RESUME: {resume_excerpt(resume_text, missing_skills, PROMPT_RESUME_TOKENS, 3000)}
+    JD: {jd_excerpt(jd_text, missing_skills, PROMPT_JD_TOKENS, 2000)}
     MISSING_SKILLS: {json.dumps(missing_skills)}
     
     TASK: Create resume bullet points for the MISSING_SKILLS.
@@ -116,7 +256,7 @@ def generate_booster_snippets_llm(resume_text: str, jd_text: str, missing_skills
       ]
     }}
     """
-    parsed, raw = _call_llm_with_retry(prompt)
+    parsed, raw = _call_llm_with_retry(prompt, required_keys=("booster_suggestions",))
     return {"booster_suggestions": parsed.get("booster_suggestions", []) if parsed else [], "raw": raw}
 
 def build_learning_path_llm(role: str, missing: List[str]) -> Dict:
@@ -134,7 +274,7 @@ def build_learning_path_llm(role: str, missing: List[str]) -> Dict:
       ]
     }}
     """
-    parsed, raw = _call_llm_with_retry(prompt)
+    parsed, raw = _call_llm_with_retry(prompt, required_keys=("learning_path",))
     return {"learning_path": parsed.get("learning_path", []) if parsed else [], "raw": raw}
 
 def suggest_future_trends_llm(role: str) -> Dict:
@@ -148,36 +288,179 @@ def suggest_future_trends_llm(role: str) -> Dict:
       ]
     }}
     """
-    parsed, raw = _call_llm_with_retry(prompt)
+    parsed, raw = _call_llm_with_retry(prompt, required_keys=("future_trends",))
     return {"future_trends": parsed.get("future_trends", []) if parsed else [], "raw": raw}
 
+# --- MEGA-PROMPT ---
+# Minimal fields each item must carry for the UI to render the section
+SECTION_REQUIRED_KEYS = {
+    "predicted_roles": ("role",),
+    "skill_levels": ("skill", "level"),
+    "booster_suggestions": ("skill", "snippet"),
+    "learning_path": ("title",),
+    "future_trends": ("name", "why"),
+}
+
+mega_stats = {"calls": 0, "sections_valid": 0, "sections_rerequested": 0}
+_mega_stats_lock = threading.Lock()
+
+def _count_mega(key: str) -> None:
+    # incremented from request threads and llm_executor workers alike
+    with _mega_stats_lock:
+        mega_stats[key] += 1
+
+def validate_section(key: str, value: Any) -> bool:
+    if not isinstance(value, list) or not value: return False
+    required = SECTION_REQUIRED_KEYS[key]
+    return all(isinstance(item, dict) and all(item.get(k) not in (None, "") for k in required) for item in value)
+
+def build_mega_prompt(resume_text: str, jd_text: str, missing_skills: List[str]) -> str:
+    is_generic = not missing_skills
+    focus = missing_skills or ["Advanced Optimization", "System Design", "Leadership"]
+    resume_queries = flatten_skills(extract_tech_keywords(resume_text)) + focus
+    return f"""
+    RESUME: {resume_excerpt(resume_text, resume_queries, PROMPT_MEGA_RESUME_TOKENS, 4000)}
+    JD: {jd_excerpt(jd_text, focus, PROMPT_JD_TOKENS, 2000)}
+    MISSING_SKILLS: {json.dumps(focus)}
+
+    TASKS:
+    1. predicted_roles: top 3 predicted roles for this candidate. The reason should be in 1-2 lines.
+    2. skill_levels: for up to 10 skills from the predicted roles' matched_skills, estimate level (Beginner/Intermediate/Expert) based on resume.
+    3. booster_suggestions: resume bullet points for the MISSING_SKILLS. If the resume has NO evidence for a skill, mark 'derived_from_resume': false.
+    {"Note: These are generic improvements." if is_generic else ""}
+    4. learning_path: a 5-step learning path to master the top predicted role and the MISSING_SKILLS.
+    5. future_trends: 3 future trends for the top predicted role, in 2-3 lines only.
+
+    RETURN JSON ONLY:
+    {{
+      "predicted_roles": [
+        {{ "role": "str", "score": 0.0-1.0, "matched_skills": ["str"], "evidence": ["str"], "reason": "str" }}
+      ],
+      "skill_levels": [
+        {{ "skill": "str", "level": "str", "confidence": 0.0-1.0, "evidence": ["str"] }}
+      ],
+      "booster_suggestions": [
+        {{ "skill": "str", "snippet": "str", "derived_from_resume": bool }}
+      ],
+      "learning_path": [
+        {{ "step": int, "title": "str", "duration_weeks": float, "type": "course|project", "notes": "str" }}
+      ],
+      "future_trends": [
+        {{ "name": "str", "why": "str" }}
+      ]
+    }}
+    """
+
 # --- ORCHESTRATOR ---
-def run_all_and_normalize(resume_text: str, jd_text: str, missing_skills: List[str]) -> Dict:
-    # 1. Roles
-    roles_data = predict_roles_llm(resume_text, jd_text)
-    roles = roles_data.get("predicted_roles", [])
-    primary_role = roles[0]["role"] if roles else "Software Engineer"
-    
-    # 2. Skill Levels 
+SectionCallback = Callable[[str, List[Any]], None]
+
+class _CallStart:
+    """Set by the worker when a submitted call leaves the queue and starts running."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.at = 0.0
+
+def _submit(fn: Callable, *args) -> Future:
+    # Run in a copy of the caller's context so timing spans land in the request's breakdown
+    ctx = contextvars.copy_context()
+    start = _CallStart()
+
+    def run():
+        start.at = time.monotonic()
+        start.event.set()
+        return ctx.run(fn, *args)
+
+    future = llm_executor.submit(run)
+    future.call_start = start
+    return future
+
+def _result(future: Future, timeout: float) -> Any:
+    """Up to `timeout` waiting in the queue, then `timeout` from when the call started running,
+    so queueing behind other analyses does not eat into the call's own budget."""
+    start: _CallStart = future.call_start
+    if not start.event.wait(timeout):
+        raise TimeoutError(f"still queued after {timeout:.0f}s")
+    return future.result(timeout=max(0.0, start.at + timeout - time.monotonic()))
+
+def _notify_section(on_section: Optional[SectionCallback], key: str, items: List[Any]) -> None:
+    # A failing consumer (stream, job) must never abort generation
+    if on_section:
+        try:
+            on_section(key, items)
+        except Exception as e:
+            print(f"on_section callback failed for '{key}': {e}")
+
+def _run_section(fn: Callable, key: str, on_section: Optional[SectionCallback], *args) -> Dict:
+    with span(f"llm.{key}"):
+        data = fn(*args)
+    _notify_section(on_section, key, data.get(key, []))
+    return data
+
+def _await_section(future: Future, key: str, timeout: float) -> Dict:
+    """Wait for a generator until its own deadline; a failed/slow call degrades to an empty section.
+
+    A call that never started is cancelled so it cannot run (and spend quota) later; one already
+    running cannot be interrupted, but its upstream attempts share the same LLM_CALL_TIMEOUT
+    deadline and stop there.
+    """
+    try:
+        return _result(future, timeout)
+    except Exception as e:
+        future.cancel()
+        print(f"LLM section '{key}' failed: {type(e).__name__}: {e}")
+        return {key: []}
+
+def _skills_to_check(roles: List[Dict]) -> List[str]:
     # Logic: Combine matched skills from prediction + missing skills to get a good mix
     skills_to_check = []
     for r in roles: 
         skills_to_check.extend(r.get("matched_skills", []))
     
-    # Cap skills to check to avoid huge prompt
-    skills_to_check = list(set(skills_to_check))[:10]
-    # If empty, use defaults inside the function
-    levels_data = estimate_skill_levels_llm(resume_text, skills_to_check)
-    
-    # 3. Boosters
+    # Cap skills to check to avoid huge prompt; dedupe in order so the prompt (and its cache key) is stable
+    return list(dict.fromkeys(skills_to_check))[:10]
+
+def run_all_and_normalize(resume_text: str, jd_text: str, missing_skills: List[str],
+                          timeout: float = LLM_CALL_TIMEOUT, on_section: Optional[SectionCallback] = None,
+                          mode: str = GENERATOR_MODE, on_item: Optional[ItemCallback] = None) -> Dict:
+    """`on_section(key, items)` fires from the worker thread as soon as each section is generated;
+    `on_item(key, item)` earlier still, per item while a reply streams (provisional: a retried
+    call may repeat items, the section event is authoritative)."""
+    # Section threads inherit this context: prompt excerpts share one embedding cache, items reach on_item
+    token = _item_sink.set(on_item)
+    try:
+        with embedding_context():
+            if mode == "mega":
+                return run_mega_and_normalize(resume_text, jd_text, missing_skills, timeout=timeout, on_section=on_section)
+            return run_multi_and_normalize(resume_text, jd_text, missing_skills, timeout=timeout, on_section=on_section)
+    finally:
+        _item_sink.reset(token)
+
+def run_multi_and_normalize(resume_text: str, jd_text: str, missing_skills: List[str],
+                            timeout: float = LLM_CALL_TIMEOUT, on_section: Optional[SectionCallback] = None) -> Dict:
+    def submit(fn, key, *args) -> Future:
+        return _submit(_run_section, fn, key, on_section, *args)
+
+    # Stage 1: roles and boosters are independent of each other
+    roles_f = submit(predict_roles_llm, "predicted_roles", resume_text, jd_text)
     # Pass missing skills; function handles empty list logic
-    boosters_data = generate_booster_snippets_llm(resume_text, jd_text, missing_skills[:5])
-    
-    # 4. Learning
-    learn_data = build_learning_path_llm(primary_role, missing_skills[:5])
-    
-    # 5. Trends
-    trends_data = suggest_future_trends_llm(primary_role)
+    boosters_f = submit(generate_booster_snippets_llm, "booster_suggestions", resume_text, jd_text, missing_skills[:5])
+
+    roles_data = _await_section(roles_f, "predicted_roles", timeout)
+    roles = roles_data.get("predicted_roles", [])
+    primary_role = roles[0]["role"] if roles else "Software Engineer"
+
+    # Stage 2: everything that needs the roles output
+    skills_to_check = _skills_to_check(roles)
+    # If empty, use defaults inside the function
+    levels_f = submit(estimate_skill_levels_llm, "skill_levels", resume_text, skills_to_check)
+    learn_f = submit(build_learning_path_llm, "learning_path", primary_role, missing_skills[:5])
+    trends_f = submit(suggest_future_trends_llm, "future_trends", primary_role)
+
+    boosters_data = _await_section(boosters_f, "booster_suggestions", timeout)
+    levels_data = _await_section(levels_f, "skill_levels", timeout)
+    learn_data = _await_section(learn_f, "learning_path", timeout)
+    trends_data = _await_section(trends_f, "future_trends", timeout)
     
     return {
         "predicted_roles": roles,
@@ -187,6 +470,58 @@ def run_all_and_normalize(resume_text: str, jd_text: str, missing_skills: List[s
         "future_trends": trends_data.get("future_trends", [])
     }
 
+def _run_mega_call(prompt: str) -> Tuple[Optional[Dict], str]:
+    with span("llm.mega"):
+        return _call_llm_with_retry(prompt, 1, required_keys=tuple(SECTION_REQUIRED_KEYS))
+
+def run_mega_and_normalize(resume_text: str, jd_text: str, missing_skills: List[str],
+                           timeout: float = LLM_CALL_TIMEOUT, on_section: Optional[SectionCallback] = None) -> Dict:
+    """One structured call for all five sections; only missing/malformed sections are re-requested
+    through their single-section generators."""
+    def submit(fn, key, *args) -> Future:
+        return _submit(_run_section, fn, key, on_section, *args)
+
+    _count_mega("calls")
+    parsed_f = _submit(_run_mega_call, build_mega_prompt(resume_text, jd_text, missing_skills[:5]))
+    try:
+        parsed, _ = _result(parsed_f, timeout)
+    except Exception as e:
+        parsed_f.cancel()
+        print(f"Mega-prompt failed: {type(e).__name__}: {e}")
+        parsed = None
+    parsed = parsed if isinstance(parsed, dict) else {}
+
+    sections: Dict[str, List[Any]] = {}
+    for key in SECTION_REQUIRED_KEYS:
+        if validate_section(key, parsed.get(key)):
+            sections[key] = parsed[key]
+            _count_mega("sections_valid")
+            _notify_section(on_section, key, sections[key])
+
+    # Re-request only what is missing or malformed
+    if "predicted_roles" not in sections:
+        _count_mega("sections_rerequested")
+        roles_f = submit(predict_roles_llm, "predicted_roles", resume_text, jd_text)
+        sections["predicted_roles"] = _await_section(roles_f, "predicted_roles", timeout).get("predicted_roles", [])
+    roles = sections["predicted_roles"]
+    primary_role = roles[0]["role"] if roles else "Software Engineer"
+
+    retry_calls = {
+        "skill_levels": (estimate_skill_levels_llm, resume_text, _skills_to_check(roles)),
+        "booster_suggestions": (generate_booster_snippets_llm, resume_text, jd_text, missing_skills[:5]),
+        "learning_path": (build_learning_path_llm, primary_role, missing_skills[:5]),
+        "future_trends": (suggest_future_trends_llm, primary_role),
+    }
+    futures = {}
+    for key, (fn, *args) in retry_calls.items():
+        if key not in sections:
+            _count_mega("sections_rerequested")
+            futures[key] = submit(fn, key, *args)
+    for key, f in futures.items():
+        sections[key] = _await_section(f, key, timeout).get(key, [])
+
+    return {key: sections.get(key, []) for key in SECTION_REQUIRED_KEYS}
+
 def build_ui_payload(combined: Dict) -> Dict:
     # Clean up structure for Frontend
     roles = combined.get("predicted_roles", [])
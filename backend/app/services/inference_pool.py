@@ -0,0 +1,212 @@
+# backend/app/services/inference_pool.py
+"""Shared SBERT inference pool for multi-worker deployments.
+
+Run once per host:   python -m app.services.inference_pool
+Then start the API with INFERENCE_POOL_ADDRESS set (uvicorn --workers N ...).
+
+The server loads the model once, then forks INFERENCE_POOL_WORKERS processes that
+inherit the weights copy-on-write (torch parameters are additionally moved to shared
+memory), each pinned to INFERENCE_POOL_TORCH_THREADS intra-op threads. Encode requests
+from every API process arrive over a local socket and are micro-batched across callers
+before being handed to a worker.
+
+The transport (multiprocessing.connection) unpickles what it receives, so the pool only
+listens on a unix socket or a loopback port, and both sides refuse to run without an
+explicit INFERENCE_POOL_AUTHKEY.
+"""
+
+import ipaddress
+import itertools
+import multiprocessing as mp
+import os
+import threading
+from multiprocessing.connection import Listener, Client
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from app.config import (
+    INFERENCE_POOL_ADDRESS, INFERENCE_POOL_AUTHKEY, INFERENCE_POOL_WORKERS,
+    INFERENCE_POOL_TORCH_THREADS, INFERENCE_POOL_TIMEOUT,
+    INFERENCE_BATCH_MAX, INFERENCE_BATCH_WAIT_MS, EMBEDDING_BATCH_SIZE,
+)
+from app.services.batching import MicroBatcher
+
+
+def parse_address(address: str):
+    """"host:port" -> TCP tuple, anything else is a unix socket path."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return (host or "127.0.0.1", int(port))
+    return address
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost": return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False
+
+def checked_transport(address: str, authkey: str = INFERENCE_POOL_AUTHKEY):
+    """(parsed address, authkey bytes); raises ValueError for a missing key or a non-loopback host."""
+    if not authkey:
+        raise ValueError("INFERENCE_POOL_AUTHKEY must be set to a private secret to use the inference pool")
+    parsed = parse_address(address)
+    if isinstance(parsed, tuple) and not _is_loopback(parsed[0]):
+        raise ValueError(f"Inference pool address {address!r} is not loopback; use 127.0.0.1:<port> or a unix socket path")
+    return parsed, authkey.encode()
+
+
+# --- SERVER ---
+_MODEL = None  # set in the parent before forking so workers inherit it
+
+def _worker_main(tasks, results, torch_threads: int) -> None:
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+    _MODEL.encode(["warmup"])
+    while True:
+        item = tasks.get()
+        if item is None: return
+        batch_id, texts = item
+        try:
+            emb = np.asarray(_MODEL.encode(texts, batch_size=EMBEDDING_BATCH_SIZE), dtype=np.float32)
+            results.put((batch_id, emb, None))
+        except Exception as e:
+            results.put((batch_id, None, f"{type(e).__name__}: {e}"))
+
+
+class InferencePoolServer:
+    def __init__(self, address: str = INFERENCE_POOL_ADDRESS, workers: int = INFERENCE_POOL_WORKERS,
+                 torch_threads: int = INFERENCE_POOL_TORCH_THREADS):
+        self.address, self._authkey = checked_transport(address)
+        self.workers = workers
+        self.torch_threads = torch_threads
+        self._ids = itertools.count()
+        self._pending: Dict[int, Any] = {}
+        self._pending_lock = threading.Lock()
+
+    def _load_model(self) -> None:
+        global _MODEL
+        from app.services.ai_models import build_sentence_model
+        _MODEL = build_sentence_model()
+        if hasattr(_MODEL, "share_memory"):
+            _MODEL.share_memory()  # torch weights in shared memory, not duplicated per worker
+
+    def _encode_on_worker(self, texts: List[str]) -> np.ndarray:
+        from concurrent.futures import Future
+        batch_id = next(self._ids)
+        future: Future = Future()
+        with self._pending_lock:
+            self._pending[batch_id] = future
+        try:
+            self._tasks.put((batch_id, texts))
+            return future.result(timeout=INFERENCE_POOL_TIMEOUT)
+        finally:
+            # on timeout nobody waits any more; a late result finds no entry and is dropped
+            with self._pending_lock:
+                self._pending.pop(batch_id, None)
+
+    def _collect_results(self) -> None:
+        while True:
+            batch_id, emb, error = self._results.get()
+            with self._pending_lock:
+                future = self._pending.pop(batch_id, None)
+            if future is None: continue
+            if error: future.set_exception(RuntimeError(error))
+            else: future.set_result(emb)
+
+    def _serve_connection(self, conn) -> None:
+        with conn:
+            while True:
+                try:
+                    msg = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    if msg.get("op") == "stats":
+                        conn.send({"ok": True, "stats": self.batcher.stats()})
+                    else:
+                        conn.send({"ok": True, "embeddings": self.batcher.encode(msg["texts"], timeout=INFERENCE_POOL_TIMEOUT)})
+                except Exception as e:
+                    conn.send({"ok": False, "error": f"{type(e).__name__}: {e}"})
+
+    def serve_forever(self) -> None:
+        self._load_model()
+        ctx = mp.get_context("fork")
+        self._tasks, self._results = ctx.Queue(), ctx.Queue()
+        procs = [ctx.Process(target=_worker_main, args=(self._tasks, self._results, self.torch_threads), daemon=True)
+                 for _ in range(self.workers)]
+        for p in procs:
+            p.start()
+
+        threading.Thread(target=self._collect_results, name="pool-results", daemon=True).start()
+        # one dispatcher per worker so every process can have a batch in flight
+        self.batcher = MicroBatcher(self._encode_on_worker, INFERENCE_BATCH_MAX, INFERENCE_BATCH_WAIT_MS,
+                                    dispatchers=self.workers, name="pool-batcher")
+
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)
+        listener = Listener(self.address, authkey=self._authkey)
+        if isinstance(self.address, str):
+            os.chmod(self.address, 0o600)  # only this user's API processes may connect
+        print(f"Inference pool: {self.workers} workers x {self.torch_threads} threads on {self.address}")
+        try:
+            while True:
+                conn = listener.accept()
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            listener.close()
+            for _ in procs:
+                self._tasks.put(None)
+
+
+# --- CLIENT ---
+class PoolClient:
+    """Thread-safe client; each calling thread keeps one persistent connection."""
+
+    def __init__(self, address: str = INFERENCE_POOL_ADDRESS):
+        self.address, self._authkey = checked_transport(address)
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = Client(self.address, authkey=self._authkey)
+        return conn
+
+    def _request(self, msg: Dict[str, Any]) -> Dict[str, Any]:
+        for attempt in range(2):
+            try:
+                conn = self._conn()
+                conn.send(msg)
+                reply = conn.recv()
+                break
+            except (EOFError, OSError):
+                self._local.conn = None  # server restarted; reconnect once
+                if attempt: raise
+        if not reply["ok"]:
+            raise RuntimeError(f"Inference pool error: {reply['error']}")
+        return reply
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        if not texts: return np.zeros((0, 0), dtype=np.float32)
+        return self._request({"op": "encode", "texts": list(texts)})["embeddings"]
+
+    def stats(self) -> Dict[str, Any]:
+        return self._request({"op": "stats"})["stats"]
+
+
+pool_client: Optional[PoolClient] = PoolClient() if INFERENCE_POOL_ADDRESS else None
+
+
+if __name__ == "__main__":
+    if not INFERENCE_POOL_ADDRESS:
+        raise SystemExit("Set INFERENCE_POOL_ADDRESS (e.g. 127.0.0.1:7071 or /tmp/career-compass-inference.sock)")
+    try:
+        server = InferencePoolServer()
+    except ValueError as e:
+        raise SystemExit(str(e))
+    server.serve_forever()
@@ -0,0 +1,73 @@
+# backend/app/services/jd_cache.py
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from app.config import JD_CACHE_MAX_ENTRIES, JD_CACHE_DIR, JD_CACHE_TTL, JD_CACHE_MAX_MB
+from app.services.cache import DiskCache
+from app.services.embeddings import encode_texts, embedding_context
+from app.services.scoring import build_jd_profile
+
+
+def jd_key(jd_text: str) -> str:
+    """Stable id for a JD: whitespace and case differences map to the same profile."""
+    norm = re.sub(r"\s+", " ", (jd_text or "").strip().lower())
+    return hashlib.sha256(norm.encode("utf-8")).hexdigest()[:32]
+
+
+class JDProfileCache:
+    """LRU of JD profiles (phrases, tech skills, embedding), optionally persisted to disk."""
+
+    def __init__(self, max_entries: int = JD_CACHE_MAX_ENTRIES, disk: Optional[DiskCache] = None):
+        self.max_entries = max_entries
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+        self._lru: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, profile: Dict[str, Any]) -> None:
+        with self._lock:
+            self._lru[key] = profile
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def lookup(self, jd_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            profile = self._lru.get(jd_id)
+            if profile is not None:
+                self._lru.move_to_end(jd_id)
+        if profile is None and self.disk is not None:
+            profile = self.disk.get(jd_id)
+            if profile is not None:
+                self._remember(jd_id, profile)
+        return profile
+
+    def get_profile(self, jd_text: str) -> Dict[str, Any]:
+        """Cached profile for this JD, computing (KeyBERT + skill extraction + embedding) on a miss."""
+        key = jd_key(jd_text)
+        profile = self.lookup(key)
+        if profile is not None:
+            self.hits += 1
+            return profile
+
+        self.misses += 1
+        with embedding_context():  # the JD embedding is KeyBERT's doc embedding, encoded once
+            profile = build_jd_profile(jd_text)
+            profile["jd_embedding"] = encode_texts([jd_text])[0].tolist()
+        profile["jd_id"] = key
+        self._remember(key, profile)
+        if self.disk is not None:
+            self.disk.set(key, profile)
+        return profile
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._lru), "persistent": self.disk is not None}
+
+
+jd_cache = JDProfileCache(disk=DiskCache(JD_CACHE_DIR, ttl_seconds=JD_CACHE_TTL, max_bytes=JD_CACHE_MAX_MB * 1024 * 1024)
+                          if JD_CACHE_DIR else None)
@@ -0,0 +1,104 @@
+# backend/app/services/jobs.py
+
+import asyncio
+import time
+import uuid
+from typing import Dict, Any, Optional, List
+
+from app.config import JOB_WORKERS, JOB_QUEUE_MAX, JOB_RESULT_TTL
+from app.services.concurrency import Overloaded
+from app.services.pipeline import run_analysis, ExtractionFailed
+
+
+class JobManager:
+    """In-process queue + worker tasks for long analyses; finished jobs are kept for `result_ttl` seconds."""
+
+    def __init__(self, workers: int = JOB_WORKERS, queue_max: int = JOB_QUEUE_MAX, result_ttl: int = JOB_RESULT_TTL):
+        self.workers = workers
+        self.queue_max = queue_max
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    # --- lifecycle ---
+    def start(self) -> None:
+        if self._tasks: return
+        self._queue = asyncio.Queue(maxsize=self.queue_max)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for t in self._tasks: t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # --- public API ---
+    def submit(self, pdf_bytes: bytes, filename: str, jd_text: str, include_timings: bool = False) -> Dict[str, Any]:
+        self._evict_expired()
+        if self._queue is None:
+            raise RuntimeError("JobManager not started")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        job = {
+            "id": job_id, "status": "queued", "stage": None,
+            "created_at": now, "updated_at": now, "finished_at": None,
+            "partial": {}, "result": None, "error": None,
+        }
+        try:
+            self._queue.put_nowait((job_id, pdf_bytes, filename, jd_text, include_timings))
+        except asyncio.QueueFull:
+            raise Overloaded("Job queue is full, retry shortly")
+        self.jobs[job_id] = job
+        return self.view(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        self._evict_expired()
+        job = self.jobs.get(job_id)
+        return self.view(job) if job else None
+
+    @staticmethod
+    def view(job: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: job[k] for k in ("id", "status", "stage", "created_at", "updated_at", "finished_at", "partial", "result", "error")}
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {"queued": self._queue.qsize() if self._queue else 0, "workers": self.workers, "jobs": counts}
+
+    # --- internals ---
+    def _update(self, job: Dict[str, Any], **fields) -> None:
+        job.update(fields)
+        job["updated_at"] = time.time()
+
+    def _evict_expired(self) -> None:
+        cutoff = time.time() - self.result_ttl
+        expired = [jid for jid, j in self.jobs.items() if j["finished_at"] and j["finished_at"] < cutoff]
+        for jid in expired:
+            del self.jobs[jid]
+
+    async def _worker(self) -> None:
+        while True:
+            job_id, pdf_bytes, filename, jd_text, include_timings = await self._queue.get()
+            job = self.jobs.get(job_id)
+            try:
+                if job is None: continue
+                self._update(job, status="running", stage="extracting")
+
+                def on_stage(name: str, payload: Dict[str, Any], job=job) -> None:
+                    job["partial"][name] = payload
+                    self._update(job, stage=name)
+
+                result = await run_analysis(pdf_bytes, filename, jd_text, on_stage=on_stage,
+                                            include_timings=include_timings)
+                self._update(job, status="done", stage="done", result=result, finished_at=time.time())
+            except ExtractionFailed as e:
+                self._update(job, status="failed", error=str(e), finished_at=time.time())
+            except Exception as e:
+                print(f"Job {job_id} Error: {e}")
+                self._update(job, status="failed", error=str(e), finished_at=time.time())
+            finally:
+                self._queue.task_done()
+
+
+job_manager = JobManager()
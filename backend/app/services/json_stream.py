@@ -0,0 +1,198 @@
+# backend/app/services/json_stream.py
+
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_CLOSER = {"{": "}", "[": "]"}
+
+
+def repair_json(text: str) -> Optional[Dict[str, Any]]:
+    """Best-effort parse of a truncated / fenced / chatty model reply.
+
+    Skips anything before the first '{', cuts back to the last point where a value was
+    complete, drops trailing commas (outside string values) and closes whatever is still
+    open. Returns None if no object survives.
+    """
+    start = text.find("{")
+    if start == -1: return None
+
+    stack: List[str] = []
+    in_str = esc = False
+    safe: Optional[Tuple[int, Tuple[str, ...]]] = None
+    end = None
+    comma: Optional[int] = None  # last comma with only whitespace after it so far
+    drop = set()                 # commas directly followed by a closer
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_str:
+            if esc: esc = False
+            elif c == "\\": esc = True
+            elif c == '"': in_str = False
+            continue
+        if c == '"':
+            in_str = True
+            comma = None
+        elif c in _CLOSER:
+            stack.append(_CLOSER[c])
+            comma = None
+        elif c in "}]":
+            if not stack or stack[-1] != c: break
+            if comma is not None:
+                drop.add(comma)
+                comma = None
+            stack.pop()
+            if not stack:
+                end = i + 1
+                break
+            safe = (i + 1, tuple(stack))
+        elif c == ",":
+            safe = (i, tuple(stack))
+            comma = i
+        elif not c.isspace():
+            comma = None
+
+    if end is not None:
+        stop, closers = end, ""
+    elif safe is not None:
+        stop, open_ = safe
+        closers = "".join(reversed(open_))
+    else:
+        return None
+    candidate = "".join(text[j] for j in range(start, stop) if j not in drop) if drop else text[start:stop]
+    try:
+        parsed = json.loads(candidate + closers)
+    except ValueError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+class StreamingJSONParser:
+    """Incremental scanner for a reply shaped like {"key": [ {...}, {...} ], ...}.
+
+    `feed(text)` returns (key, item) for every object element of a top-level array that
+    completed in that piece. `done` is set when the top-level object closes, and
+    `has_keys(keys)` once each of those top-level values is closed, so callers can stop
+    reading early. Text before the first '{' (markdown fences, prose) is ignored.
+    """
+
+    def __init__(self):
+        self.buf = ""
+        self.done = False
+        self.items = 0
+        self.closed_keys = set()
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._end: Optional[int] = None
+        self._stack: List[str] = []
+        self._in_str = False
+        self._esc = False
+        self._str_start = 0
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._item_start: Optional[int] = None
+        self._broken = False
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        self.buf += text
+        events = []
+        buf, stack = self.buf, self._stack
+        i = self._pos
+        while i < len(buf) and not self.done and not self._broken:
+            c = buf[i]
+            if self._start is None:
+                if c == "{":
+                    self._start = i
+                    stack.append("}")
+            elif self._in_str:
+                if self._esc: self._esc = False
+                elif c == "\\": self._esc = True
+                elif c == '"':
+                    self._in_str = False
+                    if len(stack) == 1:
+                        self._last_string = buf[self._str_start:i + 1]
+            elif c == '"':
+                self._in_str = True
+                self._str_start = i
+            elif c == ":" and len(stack) == 1 and self._last_string is not None:
+                try:
+                    self._key = json.loads(self._last_string)
+                except ValueError:
+                    self._key = None
+            elif c in _CLOSER:
+                if len(stack) == 2 and stack[-1] == "]" and c == "{":
+                    self._item_start = i
+                stack.append(_CLOSER[c])
+            elif c in "}]":
+                if not stack or stack[-1] != c:
+                    self._broken = True  # leave it to repair_json
+                    break
+                stack.pop()
+                if len(stack) == 2 and c == "}" and self._item_start is not None:
+                    try:
+                        events.append((self._key, json.loads(buf[self._item_start:i + 1])))
+                        self.items += 1
+                    except ValueError:
+                        pass
+                    self._item_start = None
+                elif len(stack) == 1 and self._key is not None:
+                    self.closed_keys.add(self._key)
+                elif not stack:
+                    self.done = True
+                    self._end = i + 1
+            i += 1
+        self._pos = i
+        return events
+
+    def has_keys(self, keys: Iterable[str]) -> bool:
+        return all(k in self.closed_keys for k in keys)
+
+    def result(self) -> Tuple[Optional[Dict[str, Any]], str]:
+        """(parsed object or None, outcome) with outcome one of ok | repaired | failed."""
+        if self.done:
+            try:
+                parsed = json.loads(self.buf[self._start:self._end])
+                if isinstance(parsed, dict):
+                    return parsed, "ok"
+            except ValueError:
+                pass
+        repaired = repair_json(self.buf)
+        return (repaired, "repaired") if repaired else (None, "failed")
+
+
+def parse_json_text(text: str) -> Tuple[Optional[Dict[str, Any]], str]:
+    """Parse a complete (non-streamed) reply the same way, including local repair."""
+    parser = StreamingJSONParser()
+    parser.feed(text)
+    return parser.result()
+
+
+class ParseStats:
+    """How LLM replies were turned into JSON; the repair share is re-requests we did not pay for."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {"ok": 0, "repaired": 0, "failed": 0, "early_stop": 0}
+        self.items_streamed = 0
+
+    def record(self, outcome: str, early_stop: bool = False, items: int = 0) -> None:
+        with self._lock:
+            self.counts[outcome] += 1
+            self.counts["early_stop"] += int(early_stop)
+            self.items_streamed += items
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            c = dict(self.counts)
+            items = self.items_streamed
+        replies = c["ok"] + c["repaired"] + c["failed"]
+        return {
+            **c,
+            "replies": replies,
+            "items_streamed": items,
+            "repair_rate": round(c["repaired"] / replies, 4) if replies else 0.0,
+            "failure_rate": round(c["failed"] / replies, 4) if replies else 0.0,
+        }
+
+
+parse_stats = ParseStats()
@@ -0,0 +1,152 @@
+# backend/app/services/pipeline.py
+
+import asyncio
+from typing import Dict, Any, Callable, Optional, AsyncIterator, List, Tuple
+
+from app.services.concurrency import run_io, run_inference
+from app.services.extractor import extract_pdf
+from app.services.scoring import calculate_ats_analysis, rank_resumes
+from app.services.jd_cache import jd_cache
+from app.services.generator import run_all_and_normalize, build_ui_payload, SectionCallback, ItemCallback
+from app.services.metrics import span, timing_context
+from app.services.upstream import llm_upstream
+
+
+class ExtractionFailed(Exception):
+    pass
+
+
+def _score(resume_text: str, jd_text: str) -> Dict[str, Any]:
+    # JD side (KeyBERT phrases, tech skills, embedding) comes from the profile cache on repeat JDs
+    with span("score.jd_profile"):
+        profile = jd_cache.get_profile(jd_text)
+    return calculate_ats_analysis(resume_text, jd_text, jd_profile=profile)
+
+def _rank(resumes: Dict[str, str], jd_text: str) -> List[Dict[str, Any]]:
+    return rank_resumes(resumes, jd_text, jd_profile=jd_cache.get_profile(jd_text))
+
+
+async def run_analysis(pdf_bytes: bytes, filename: str, jd_text: str,
+                       on_stage: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                       on_section: Optional[SectionCallback] = None,
+                       include_timings: bool = False,
+                       on_item: Optional[ItemCallback] = None) -> Dict[str, Any]:
+    """Extract -> score -> generate, with every blocking step off the event loop.
+
+    `on_stage(name, payload)` is called after "extracted" and "scored" so callers can surface partial results;
+    `on_section` / `on_item` are handed to the generator orchestrator (called from worker threads).
+    With `include_timings`, every span of this request is listed under `meta.timings`.
+    """
+    if include_timings:
+        with timing_context() as timings:
+            result = await _run_analysis(pdf_bytes, filename, jd_text, on_stage, on_section, on_item)
+        result["meta"]["timings"] = timings
+        return result
+    return await _run_analysis(pdf_bytes, filename, jd_text, on_stage, on_section, on_item)
+
+async def _run_analysis(pdf_bytes: bytes, filename: str, jd_text: str,
+                        on_stage: Optional[Callable[[str, Dict[str, Any]], None]],
+                        on_section: Optional[SectionCallback],
+                        on_item: Optional[ItemCallback] = None) -> Dict[str, Any]:
+    # 1. Extract
+    print("Extracting PDF...")
+    with span("extract"):
+        extraction = await run_io(extract_pdf, pdf_bytes, filename)
+    resume_text = extraction["text"]
+    if not resume_text:
+        raise ExtractionFailed("Failed to extract text from PDF")
+    extraction_meta = {k: v for k, v in extraction.items() if k != "text"}
+    if on_stage: on_stage("extracted", {"extraction": extraction_meta})
+
+    # 2. Score (Math)
+    print("Scoring...")
+    with span("score"):
+        ats_result = await run_inference(_score, resume_text, jd_text)
+    ats_result["meta"]["extraction"] = extraction_meta
+    if on_stage: on_stage("scored", ats_result)
+
+    # 3. Generate (LLM) -- skipped while the LLM circuit is open: the ATS result still stands on its own
+    if not llm_upstream.available():
+        print("LLM circuit open, returning ATS-only result")
+        ats_result["meta"]["llm"] = {"status": "skipped", "reason": "circuit_open"}
+        return {**ats_result, **build_ui_payload({})}
+
+    print("Generating Advice...")
+    with span("generate"):
+        llm_result_raw = await run_io(run_all_and_normalize, resume_text, jd_text, ats_result["missing_skills"],
+                                      on_section=on_section, on_item=on_item)
+    # The circuit may have opened part-way through; sections generated after that are empty
+    ats_result["meta"]["llm"] = {"status": "ok" if llm_upstream.available() else "degraded"}
+
+    # Convert raw LLM data to UI-friendly format
+    # This converts 'predicted_roles' -> 'roles' so the Frontend doesn't crash
+    llm_result_clean = build_ui_payload(llm_result_raw)
+
+    # 4. Merge & Return
+    return {**ats_result, **llm_result_clean}
+
+
+# --- STREAMING ---
+def _section_event(key: str, items: List[Any]) -> Dict[str, Any]:
+    # Same field names as build_ui_payload so the frontend can merge events as they arrive
+    if key == "predicted_roles":
+        ui = build_ui_payload({"predicted_roles": items})
+        return {"event": "section", "section": "roles", "data": items, "primary_role": ui["primary_role"]}
+    return {"event": "section", "section": key, "data": items}
+
+def _item_event(key: str, item: Any) -> Dict[str, Any]:
+    # Provisional: one item of a section still being generated
+    return {"event": "item", "section": "roles" if key == "predicted_roles" else key, "data": item}
+
+async def stream_analysis(pdf_bytes: bytes, filename: str, jd_text: str,
+                          include_timings: bool = False) -> AsyncIterator[Dict[str, Any]]:
+    """Yield events as the pipeline progresses: extracted, scored (ATS result), item events
+    while replies stream, one section per generator, then done (full merged payload) or error."""
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def emit(event: Dict[str, Any]) -> None:
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    async def _run() -> None:
+        try:
+            result = await run_analysis(
+                pdf_bytes, filename, jd_text,
+                on_stage=lambda name, payload: emit({"event": name, "data": payload}),
+                on_section=lambda key, items: emit(_section_event(key, items)),
+                on_item=lambda key, item: emit(_item_event(key, item)),
+                include_timings=include_timings,
+            )
+            emit({"event": "done", "data": result})
+        except ExtractionFailed as e:
+            emit({"event": "error", "status": 400, "detail": str(e)})
+        except Exception as e:
+            print(f"Error: {e}")
+            emit({"event": "error", "status": 500, "detail": str(e)})
+
+    task = asyncio.create_task(_run())
+    try:
+        while True:
+            event = await events.get()
+            yield event
+            if event["event"] in ("done", "error"):
+                break
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+# --- BULK RANKING ---
+async def run_ranking(files: List[Tuple[str, bytes]], jd_text: str) -> Dict[str, Any]:
+    """Extract N resumes concurrently, then rank them against one JD in a single inference job."""
+    extractions = await asyncio.gather(*[run_io(extract_pdf, data, name) for name, data in files])
+
+    resumes, failed = {}, []
+    for (name, _), extraction in zip(files, extractions):
+        if extraction["text"]:
+            resumes[name] = extraction["text"]
+        else:
+            failed.append({"id": name, "error": "Failed to extract text from PDF"})
+
+    ranked = await run_inference(_rank, resumes, jd_text) if resumes else []
+    return {"ranked": ranked, "failed": failed, "total": len(files)}
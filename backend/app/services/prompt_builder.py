@@ -0,0 +1,126 @@
+# backend/app/services/prompt_builder.py
+
+import math
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+from app.config import PROMPT_EXCERPTS_ENABLED
+from app.services.cache import MemoryCache, content_key
+from app.services.chunk_index import ChunkSet
+from app.services.embeddings import encode_texts, normalize_rows
+from app.services.scoring import resume_chunks, _chunk_text, _chunk_originals
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+class PromptStats:
+    """Estimated input tokens sent vs. what the old fixed character slices would have sent."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.excerpts = 0
+        self.fallbacks = 0
+        self.tokens_sent = 0
+        self.tokens_baseline = 0
+
+    def record(self, sent: str, baseline_chars: int, fallback: bool = False) -> None:
+        with self._lock:
+            self.excerpts += 1
+            self.fallbacks += int(fallback)
+            self.tokens_sent += estimate_tokens(sent)
+            self.tokens_baseline += math.ceil(baseline_chars / CHARS_PER_TOKEN)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": PROMPT_EXCERPTS_ENABLED,
+                "excerpts": self.excerpts,
+                "fallbacks": self.fallbacks,
+                "est_tokens_sent": self.tokens_sent,
+                "est_tokens_baseline": self.tokens_baseline,
+                "saved_ratio": round(1 - self.tokens_sent / self.tokens_baseline, 4) if self.tokens_baseline else 0.0,
+            }
+
+
+prompt_stats = PromptStats()
+
+# JDs repeat across requests far more than resumes do; keep their chunk vectors around
+_jd_chunks = MemoryCache(max_entries=256)
+
+
+def select_chunks(chunk_set: ChunkSet, queries: List[str], budget_tokens: int, keep_first: bool = True,
+                  originals: Optional[List[str]] = None) -> str:
+    """Most relevant chunks for `queries` that fit in `budget_tokens`, joined in document order.
+
+    Each query first gets its single best chunk (so every skill asked about has evidence),
+    then the rest are ranked by their best similarity to any query. With no queries the
+    chunks are taken in order. `keep_first` always includes the opening chunk (name, summary).
+    Ranking uses the normalized chunks; `originals` (same order) is what gets returned, so the
+    prompt keeps the source's case and punctuation (Node.js, v0.2, jane@x.com).
+    """
+    chunks = originals if originals is not None and len(originals) == len(chunk_set.chunks) else chunk_set.chunks
+    n = len(chunks)
+    queries = [q.lower().strip() for q in queries if q and q.strip()]
+
+    if queries and n:
+        sims = normalize_rows(encode_texts(queries)) @ np.asarray(chunk_set.emb).T  # (n_queries, n_chunks)
+        order = list(dict.fromkeys(int(i) for i in np.argmax(sims, axis=1)))
+        order += [int(i) for i in np.argsort(-sims.max(axis=0)) if int(i) not in order]
+    else:
+        order = list(range(n))
+    if keep_first and n:
+        order = [0] + [i for i in order if i != 0]
+
+    budget_chars = budget_tokens * CHARS_PER_TOKEN
+    picked, used = [], 0
+    for i in order:
+        cost = len(chunks[i]) + 1
+        if used + cost > budget_chars: continue  # a shorter chunk further down may still fit
+        picked.append(i)
+        used += cost
+    return "\n".join(chunks[i] for i in sorted(picked))
+
+
+def _excerpt(text: str, chunk_set_fn, queries: List[str], budget_tokens: int, baseline_chars: int, label: str) -> str:
+    raw = text or ""
+    text = raw.strip()
+    baseline = min(len(text), baseline_chars)
+    if estimate_tokens(text) <= budget_tokens:
+        prompt_stats.record(text, baseline)
+        return text
+    if not PROMPT_EXCERPTS_ENABLED:
+        prompt_stats.record(text[:baseline_chars], baseline, fallback=True)
+        return text[:baseline_chars]
+    try:
+        # chunk on the untouched text so the resume hits the chunk-index entry scoring created
+        out, fallback = select_chunks(chunk_set_fn(raw), queries, budget_tokens, originals=_chunk_originals(raw)), False
+    except Exception as e:
+        print(f"{label} excerpt failed, using prefix: {type(e).__name__}: {e}")
+        out, fallback = text[:budget_tokens * CHARS_PER_TOKEN], True
+    prompt_stats.record(out, baseline, fallback=fallback)
+    return out
+
+def _jd_chunk_set(jd_text: str) -> ChunkSet:
+    key = content_key("jd_chunks", jd_text)
+    entry = _jd_chunks.get(key)
+    if entry is None:
+        chunks = _chunk_text(jd_text)
+        emb = normalize_rows(encode_texts(chunks)) if chunks else np.zeros((0, 0), dtype=np.float32)
+        entry = ChunkSet(key, chunks, emb)
+        _jd_chunks.set(key, entry)
+    return entry
+
+def resume_excerpt(resume_text: str, queries: List[str], budget_tokens: int, baseline_chars: int) -> str:
+    """Resume context for one prompt, from the chunk vectors already built for scoring.
+    `baseline_chars` is the old fixed slice, kept for the token-savings stats and as the
+    fallback when excerpts are disabled."""
+    return _excerpt(resume_text, resume_chunks, queries, budget_tokens, baseline_chars, "Resume")
+
+def jd_excerpt(jd_text: str, queries: List[str], budget_tokens: int, baseline_chars: int) -> str:
+    return _excerpt(jd_text, _jd_chunk_set, queries, budget_tokens, baseline_chars, "JD")
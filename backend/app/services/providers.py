@@ -0,0 +1,297 @@
+# backend/app/services/providers.py
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Iterator, Optional
+
+from app.config import (
+    GOOGLE_API_KEY, LLMWHISPERER_API_KEY, LLM_PROVIDER, OCR_PROVIDER, PROVIDER_REPLAY_DIR,
+    FAKE_LLM_LATENCY_MS, FAKE_OCR_LATENCY_MS, FAKE_LATENCY_JITTER, FAKE_FAILURE_RATE,
+)
+from app.services.cache import DiskCache, content_key
+
+LLM_MODEL_NAME = 'gemini-2.5-flash'
+WHISPER_PARAMS = {"mode": "high_quality", "horizontal_stretch_factor": "1.05"}
+
+
+class ReplayMiss(LookupError):
+    """A replay provider was asked for something that was never recorded."""
+
+
+# --- INTERFACES ---
+class LLMProvider:
+    """prompt -> raw model text. `cache_namespace` keeps fake output out of caches shared with real output.
+    `timeout` (seconds) is the most the call may take; the upstream layer passes what is left of its deadline."""
+    name = "base"
+    cache_namespace = ""
+
+    def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        raise NotImplementedError
+
+    def generate_stream(self, prompt: str, timeout: Optional[float] = None) -> Iterator[str]:
+        """Reply as text pieces in arrival order; providers without streaming yield it whole."""
+        yield self.generate(prompt, timeout)
+
+class OCRProvider:
+    """PDF bytes -> extracted text ("" when nothing could be read)."""
+    name = "base"
+    cache_namespace = ""
+
+    def extract(self, pdf_bytes: bytes, filename: str, timeout: Optional[float] = None) -> str:
+        raise NotImplementedError
+
+
+# --- LIVE ---
+class GeminiProvider(LLMProvider):
+    name = "gemini"
+
+    def __init__(self, model_name: str = LLM_MODEL_NAME):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def model(self):
+        """Gemini model handle, configured on first use so importing stays cheap."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    import google.generativeai as genai
+                    genai.configure(api_key=GOOGLE_API_KEY)
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    @staticmethod
+    def _request_options(timeout: Optional[float]) -> Optional[dict]:
+        return {"timeout": timeout} if timeout else None
+
+    def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        return self.model().generate_content(prompt, request_options=self._request_options(timeout)).text
+
+    def generate_stream(self, prompt: str, timeout: Optional[float] = None) -> Iterator[str]:
+        for chunk in self.model().generate_content(prompt, stream=True, request_options=self._request_options(timeout)):
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+
+class LLMWhispererProvider(OCRProvider):
+    name = "llmwhisperer"
+
+    def __init__(self, client=None):
+        self._client = client
+        self._lock = threading.Lock()
+
+    def client(self):
+        """LLMWhisperer client, created on first remote extraction rather than at import."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from unstract.llmwhisperer import LLMWhispererClientV2
+                    self._client = LLMWhispererClientV2(api_key=LLMWHISPERER_API_KEY)
+        return self._client
+
+    def extract(self, pdf_bytes: bytes, filename: str, timeout: Optional[float] = None) -> str:
+        # The client takes a path, so save the upload temporarily
+        temp_path = f"temp_{threading.get_ident()}_{os.path.basename(filename)}"
+        with open(temp_path, "wb") as buffer:
+            buffer.write(pdf_bytes)
+        try:
+            # wait_timeout bounds both the upload request and the status polling that follows
+            wait = {"wait_timeout": max(1, int(timeout))} if timeout else {}
+            res = self.client().whisper(file_path=temp_path, wait_for_completion=True, **wait, **WHISPER_PARAMS)
+            if res.get("status_code") != 200:
+                # The client reports a timed-out / failed job in the result instead of raising
+                raise RuntimeError(f"LLMWhisperer: {res.get('message', 'extraction failed')}")
+            return res["extraction"]["result_text"]
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+# --- FAKES (offline, simulated latency) ---
+class _SimulatedUpstream:
+    def __init__(self, latency_ms: float, jitter: float, failure_rate: float, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def _simulate(self, share: float = 1.0, timeout: Optional[float] = None) -> None:
+        """Sleep `share` of the configured latency; a failure is drawn on every call. Latency beyond
+        `timeout` behaves like a client-side timeout."""
+        with self._rng_lock:
+            factor = 1 + self._rng.uniform(-self.jitter, self.jitter)
+            fail = self._rng.random() < self.failure_rate * share
+        delay = max(0.0, self.latency_ms * share * factor) / 1000.0
+        if timeout is not None and delay > timeout:
+            time.sleep(max(0.0, timeout))
+            raise TimeoutError(f"{self.name}: simulated upstream timeout")
+        time.sleep(delay)
+        if fail:
+            raise RuntimeError(f"{self.name}: simulated upstream failure")
+
+class FakeLLMProvider(_SimulatedUpstream, LLMProvider):
+    """Answers every section named in the prompt with small, schema-valid JSON."""
+    name = "fake"
+    cache_namespace = "fake"
+
+    SECTIONS = {
+        "predicted_roles": [
+            {"role": "Backend Engineer", "score": 0.82, "matched_skills": ["python", "sql"], "reason": "Fake provider"},
+            {"role": "Data Engineer", "score": 0.64, "matched_skills": ["python"], "reason": "Fake provider"},
+        ],
+        "skill_levels": [{"skill": "python", "level": "Advanced", "evidence": "Fake provider"}],
+        "booster_suggestions": [{"skill": "docker", "snippet": "Containerized services with Docker.", "derived_from_resume": False}],
+        "learning_path": [{"step": 1, "title": "Docker fundamentals", "duration_weeks": 2, "type": "course", "notes": ""}],
+        "future_trends": [{"name": "Platform engineering", "why": "Fake provider"}],
+    }
+
+    def __init__(self, latency_ms: float = FAKE_LLM_LATENCY_MS, jitter: float = FAKE_LATENCY_JITTER,
+                 failure_rate: float = FAKE_FAILURE_RATE, seed: Optional[int] = None):
+        super().__init__(latency_ms, jitter, failure_rate, seed)
+
+    def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        self._simulate(timeout=timeout)
+        return self._reply(prompt)
+
+    def generate_stream(self, prompt: str, timeout: Optional[float] = None, pieces: int = 8) -> Iterator[str]:
+        # Same total latency (and roughly the same failure odds) as generate(), spread like a token stream
+        reply = self._reply(prompt)
+        step = max(1, -(-len(reply) // pieces))
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for i in range(0, len(reply), step):
+            self._simulate(share=1.0 / pieces, timeout=deadline - time.monotonic() if deadline else None)
+            yield reply[i:i + step]
+
+    def _reply(self, prompt: str) -> str:
+        return json.dumps({k: v for k, v in self.SECTIONS.items() if k in prompt})
+
+class FakeOCRProvider(_SimulatedUpstream, OCRProvider):
+    """Returns the bytes as text when they are plain UTF-8 (handy for load tests), else a sample resume."""
+    name = "fake"
+    cache_namespace = "fake"
+
+    SAMPLE = ("Sample Candidate | sample@example.com | +1 5550000000\nEXPERIENCE\n"
+              "- Built REST APIs in Python and FastAPI backed by PostgreSQL.\n"
+              "- Deployed services with Docker on AWS.\nPROJECTS\n- Analytics dashboard in React.\n"
+              "EDUCATION\nB.Tech Computer Science\nSKILLS\nPython, SQL, Docker, AWS, React")
+
+    def __init__(self, latency_ms: float = FAKE_OCR_LATENCY_MS, jitter: float = FAKE_LATENCY_JITTER,
+                 failure_rate: float = FAKE_FAILURE_RATE, seed: Optional[int] = None):
+        super().__init__(latency_ms, jitter, failure_rate, seed)
+
+    def extract(self, pdf_bytes: bytes, filename: str, timeout: Optional[float] = None) -> str:
+        self._simulate(timeout=timeout)
+        try:
+            text = pdf_bytes.decode("utf-8")
+            if text.strip() and not re.search(r"[\x00-\x08\x0e-\x1f]", text):
+                return text
+        except UnicodeDecodeError:
+            pass
+        return self.SAMPLE
+
+
+# --- RECORD / REPLAY ---
+def _store(kind: str, directory: str = PROVIDER_REPLAY_DIR) -> DiskCache:
+    return DiskCache(os.path.join(directory, kind))
+
+class RecordingLLMProvider(LLMProvider):
+    """Calls the live provider and saves each response, keyed by model + prompt."""
+    name = "record"
+
+    def __init__(self, inner: LLMProvider, store: DiskCache):
+        self.inner = inner
+        self.store = store
+
+    def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        text = self.inner.generate(prompt, timeout)
+        if text:
+            self.store.set(content_key(LLM_MODEL_NAME, prompt), text)
+        return text
+
+    def generate_stream(self, prompt: str, timeout: Optional[float] = None) -> Iterator[str]:
+        # Only a reply read to the end is recorded; an early-stopped stream is not a full response
+        pieces = []
+        for piece in self.inner.generate_stream(prompt, timeout):
+            pieces.append(piece)
+            yield piece
+        if pieces:
+            self.store.set(content_key(LLM_MODEL_NAME, prompt), "".join(pieces))
+
+class ReplayLLMProvider(LLMProvider):
+    """Serves recorded responses only; never touches the network."""
+    name = "replay"
+
+    def __init__(self, store: DiskCache):
+        self.store = store
+
+    def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        text = self.store.get(content_key(LLM_MODEL_NAME, prompt))
+        if text is None:
+            raise ReplayMiss("No recorded LLM response for this prompt")
+        return text
+
+class RecordingOCRProvider(OCRProvider):
+    name = "record"
+
+    def __init__(self, inner: OCRProvider, store: DiskCache):
+        self.inner = inner
+        self.store = store
+
+    def extract(self, pdf_bytes: bytes, filename: str, timeout: Optional[float] = None) -> str:
+        text = self.inner.extract(pdf_bytes, filename, timeout)
+        if text:
+            self.store.set(content_key(pdf_bytes, WHISPER_PARAMS), text)
+        return text
+
+class ReplayOCRProvider(OCRProvider):
+    name = "replay"
+
+    def __init__(self, store: DiskCache):
+        self.store = store
+
+    def extract(self, pdf_bytes: bytes, filename: str, timeout: Optional[float] = None) -> str:
+        text = self.store.get(content_key(pdf_bytes, WHISPER_PARAMS))
+        if text is None:
+            raise ReplayMiss(f"No recorded extraction for {filename}")
+        return text
+
+
+# --- SELECTION ---
+def build_llm_provider(kind: str = LLM_PROVIDER) -> LLMProvider:
+    if kind == "gemini": return GeminiProvider()
+    if kind == "fake": return FakeLLMProvider()
+    if kind == "record": return RecordingLLMProvider(GeminiProvider(), _store("llm"))
+    if kind == "replay": return ReplayLLMProvider(_store("llm"))
+    raise ValueError(f"Unknown LLM_PROVIDER: {kind}")
+
+def build_ocr_provider(kind: str = OCR_PROVIDER, client=None) -> OCRProvider:
+    if kind == "llmwhisperer": return LLMWhispererProvider(client)
+    if kind == "fake": return FakeOCRProvider()
+    if kind == "record": return RecordingOCRProvider(LLMWhispererProvider(client), _store("ocr"))
+    if kind == "replay": return ReplayOCRProvider(_store("ocr"))
+    raise ValueError(f"Unknown OCR_PROVIDER: {kind}")
+
+_llm_provider: Optional[LLMProvider] = None
+_ocr_provider: Optional[OCRProvider] = None
+_provider_lock = threading.Lock()
+
+def get_llm_provider() -> LLMProvider:
+    global _llm_provider
+    if _llm_provider is None:
+        with _provider_lock:
+            if _llm_provider is None:
+                _llm_provider = build_llm_provider()
+    return _llm_provider
+
+def get_ocr_provider() -> OCRProvider:
+    global _ocr_provider
+    if _ocr_provider is None:
+        with _provider_lock:
+            if _ocr_provider is None:
+                _ocr_provider = build_ocr_provider()
+    return _ocr_provider
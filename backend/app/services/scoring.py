@@ -3,13 +3,15 @@
 import re
 import math
 import numpy as np
-from typing import List, Tuple, Dict, Any
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import util
+from typing import List, Tuple, Dict, Any, Optional
 
 # --- LOCAL IMPORTS ---
 from app.services.ai_models import ai_loader
-from app.data.skills import TECH_SKILLS, ALIASES, FLAT_SKILLS
+from app.services.skill_matcher import skill_matcher
+from app.services.embeddings import embedding_context, encode_texts, normalize_rows
+from app.services.chunk_index import ResumeChunkIndex, ChunkSet
+from app.services.metrics import span
+from app.config import CHUNK_INDEX_ENABLED, CHUNK_INDEX_DIR, CHUNK_INDEX_MAX_MB
 
 # --- CONSTANTS ---
 JD_STOP_PHRASES = {
@@ -31,24 +33,49 @@ def _clean(text: str) -> str:
 def _clean_lower(text: str) -> str:
     return re.sub(r"\s+", " ", (text or "").strip().lower())
 
-def _chunk_text(text: str, max_len: int = 256) -> List[str]:
-    text = _clean_lower(text)
-    sents = re.split(r"[.\n;]", text)
-    chunks, cur = [], ""
-    for s in sents:
-        s = s.strip()
+def _chunk_spans(text: str, max_len: int = 256) -> List[Tuple[str, int, int]]:
+    """(normalized chunk, start, end) where text[start:end] is the same chunk in its original form.
+
+    Newlines are only whitespace here (they are collapsed before splitting), so sentences split on
+    '.' and ';' alone.
+    """
+    text = text or ""
+    spans, cur, start, end = [], "", 0, 0
+    for m in re.finditer(r"[^.;]+", text):
+        s = _clean_lower(m.group())
         if not s: continue
         if len(cur) + len(s) < max_len:
+            if not cur: start = m.start()
             cur += (" " + s) if cur else s
         else:
-            if cur: chunks.append(cur)
-            cur = s
-    if cur: chunks.append(cur)
-    return chunks
+            if cur: spans.append((cur, start, end))
+            cur, start = s, m.start()
+        end = m.end()
+    if cur: spans.append((cur, start, end))
+    return spans
+
+def _chunk_text(text: str, max_len: int = 256) -> List[str]:
+    return [chunk for chunk, _, _ in _chunk_spans(text, max_len)]
+
+def _chunk_originals(text: str, max_len: int = 256) -> List[str]:
+    """The chunks of `_chunk_text`, in original case and punctuation (for showing or prompting)."""
+    # each span stops short of its closing '.' / ';' -- keep it, it is part of the sentence
+    return [text[start:end + 1].strip() for _, start, end in _chunk_spans(text, max_len)]
+
+chunk_index = ResumeChunkIndex(
+    CHUNK_INDEX_DIR, max_bytes=CHUNK_INDEX_MAX_MB * 1024 * 1024, chunker=_chunk_text,
+) if CHUNK_INDEX_ENABLED else None
+
+def resume_chunks(resume_text: str) -> ChunkSet:
+    """Chunks + normalized embeddings for a resume, from the persistent index when enabled."""
+    if chunk_index is not None:
+        return chunk_index.get(resume_text)
+    chunks = _chunk_text(resume_text)
+    return ChunkSet("", chunks, normalize_rows(encode_texts(chunks)) if chunks else np.zeros((0, 0), dtype=np.float32))
 
 # --- 2. EXTRACTION LOGIC ---
 def extract_jd_phrases(jd_text: str, top_k: int = 25) -> List[str]:
-    jd_text = _clean(jd_text)
+    raw_text, jd_text = jd_text, _clean(jd_text)
     if not jd_text: return []
     
     # USE SINGLETON MODEL
@@ -57,6 +84,8 @@ def extract_jd_phrases(jd_text: str, top_k: int = 25) -> List[str]:
     kw_scores = kw_model.extract_keywords(
         jd_text, keyphrase_ngram_range=(1, 2), stop_words="english",
         use_mmr=True, diversity=0.3, top_n=top_k, nr_candidates=80,
+        # the uncleaned text: same tokens for SBERT, and the same cache key as the JD profile's embedding
+        doc_embeddings=encode_texts([raw_text]),
     )
     cleaned, seen = [], set()
     for kw, _ in kw_scores:
@@ -70,20 +99,8 @@ def extract_jd_phrases(jd_text: str, top_k: int = 25) -> List[str]:
     return cleaned
 
 def extract_tech_keywords(text: str) -> Dict[str, List[str]]:
-    norm = _clean_lower(text)
-    found = {cat: set() for cat in TECH_SKILLS.keys()}
-    found["other"] = set()
-    for skill, cat in FLAT_SKILLS.items():
-        pattern = r"(?<![a-z0-9])" + re.escape(skill) + r"(?![a-z0-9])"
-        if re.search(pattern, norm):
-            canon = ALIASES.get(skill, skill)
-            canonical_cat = None
-            for c, items in TECH_SKILLS.items():
-                if canon in items:
-                    canonical_cat = c
-                    break
-            found[canonical_cat or cat].add(canon)
-    return {cat: sorted(list(vals)) for cat, vals in found.items() if vals}
+    # Single pass over the text; automaton + canon->category index are built at import
+    return skill_matcher.extract(_clean_lower(text))
 
 def flatten_skills(tech_dict: Dict[str, List[str]]) -> List[str]:
     out = []
@@ -91,6 +108,8 @@ def flatten_skills(tech_dict: Dict[str, List[str]]) -> List[str]:
     return sorted(set(out))
 
 # --- 3. PRESENCE CHECK ---
+GENERIC_KW_TOKENS = {"development", "skills", "experience", "role", "model", "concepts"}
+
 def check_presence(keywords: List[str], resume_text: str, sim_threshold: float = 0.6) -> Dict[str, Any]:
     resume_clean = _clean_lower(resume_text)
     if not keywords or not resume_clean:
@@ -99,42 +118,49 @@ def check_presence(keywords: List[str], resume_text: str, sim_threshold: float =
     chunks = _chunk_text(resume_text)
     if not chunks: return {"score": 0.0, "matched_count": 0, "total": len(keywords), "matched": [], "unmatched": keywords, "details": []}
 
-    # USE SINGLETON MODEL
-    sentence_model = ai_loader.sentence_model
-    chunk_emb = sentence_model.encode(chunks)
-    
-    matched, unmatched, details = [], [], []
-
-    for kw in keywords:
+    # Pass 1: cheap exact/token checks; collect everything that needs embeddings
+    results = {}  # keyword index -> detail dict (None = unmatched)
+    pending = []  # (keyword index, kw_l, token count)
+    for i, kw in enumerate(keywords):
         kw_l = kw.lower().strip()
         if not kw_l: continue
 
         # Exact
         if kw_l in resume_clean:
-            matched.append(kw)
-            details.append({"keyword": kw, "match_type": "exact", "similarity": 1.0, "snippet": "substring"})
+            results[i] = {"keyword": kw, "match_type": "exact", "similarity": 1.0, "snippet": "substring"}
             continue
 
         # Token
         tokens = [t for t in re.split(r"\W+", kw_l) if t]
-        important = [t for t in tokens if t not in {"development", "skills", "experience", "role", "model", "concepts"}] or tokens
+        important = [t for t in tokens if t not in GENERIC_KW_TOKENS] or tokens
         if any(tok in resume_clean for tok in important):
-            matched.append(kw)
-            details.append({"keyword": kw, "match_type": "token", "similarity": 1.0, "snippet": "token match"})
+            results[i] = {"keyword": kw, "match_type": "token", "similarity": 1.0, "snippet": "token match"}
             continue
 
-        # Semantic
-        kw_emb = sentence_model.encode([kw_l])
-        sims = cosine_similarity(kw_emb, chunk_emb)[0]
-        best_idx = int(np.argmax(sims))
-        best_sim = float(sims[best_idx])
-        thresh = max(sim_threshold - 0.05, 0.5) if len(tokens) <= 2 else sim_threshold
-        
-        if best_sim >= thresh:
-            matched.append(kw)
-            details.append({"keyword": kw, "match_type": "semantic", "similarity": round(best_sim, 3), "snippet": chunks[best_idx][:200]})
+        pending.append((i, kw_l, len(tokens)))
+
+    # Pass 2: Semantic - chunk vectors come from the resume index, unresolved keywords are
+    # encoded in one call, and a single top-1 search scores them all
+    if pending:
+        indexed = resume_chunks(resume_text)
+        kw_emb = encode_texts([kw_l for _, kw_l, _ in pending])
+        best_idx, best_sim = indexed.search(kw_emb, k=1)
+
+        for (i, _, n_tokens), idx, sim in zip(pending, best_idx[:, 0], best_sim[:, 0]):
+            sim = float(sim)
+            thresh = max(sim_threshold - 0.05, 0.5) if n_tokens <= 2 else sim_threshold
+            if sim >= thresh:
+                results[i] = {"keyword": keywords[i], "match_type": "semantic", "similarity": round(sim, 3), "snippet": indexed.chunks[int(idx)][:200]}
+            else:
+                results[i] = None
+
+    matched, unmatched, details = [], [], []
+    for i in sorted(results):
+        if results[i] is None:
+            unmatched.append(keywords[i])
         else:
-            unmatched.append(kw)
+            matched.append(keywords[i])
+            details.append(results[i])
 
     score = (len(matched) / len(keywords)) * 100 if keywords else 0.0
     return {"score": round(score, 2), "matched_count": len(matched), "total": len(keywords), "matched": matched, "unmatched": unmatched, "details": details}
@@ -142,10 +168,8 @@ def check_presence(keywords: List[str], resume_text: str, sim_threshold: float =
 # --- 4. SCORING FUNCTIONS ---
 def calculate_semantic_score(res_text, jd_text):
     try:
-        model = ai_loader.sentence_model
-        e1 = model.encode(res_text, convert_to_tensor=True)
-        e2 = model.encode(jd_text, convert_to_tensor=True)
-        return round(max(0, min(util.cos_sim(e1, e2).item() * 100, 100)), 2)
+        e1, e2 = normalize_rows(encode_texts([res_text, jd_text]))
+        return round(max(0, min(float(e1 @ e2) * 100, 100)), 2)
     except: return 0
 
 def calculate_format_score(resume_text):
@@ -172,11 +196,22 @@ def calculate_experience_score(resume_text):
     return min(score, 100)
 
 # --- 5. ORCHESTRATORS ---
-def evaluate_jd_resume(jd_text: str, resume_text: str, top_k_jd=20, sim_threshold=0.6):
-    jd_phrases = extract_jd_phrases(jd_text, top_k=top_k_jd)
+def build_jd_profile(jd_text: str, top_k_jd: int = 20) -> Dict[str, Any]:
+    """Everything on the JD side of the comparison; compute once and reuse across resumes."""
+    return {
+        "jd_text": jd_text,
+        "top_k_jd": top_k_jd,
+        "jd_phrases": extract_jd_phrases(jd_text, top_k=top_k_jd),
+        "jd_tech_flat": flatten_skills(extract_tech_keywords(jd_text)),
+    }
+
+def evaluate_jd_resume(jd_text: str, resume_text: str, top_k_jd=20, sim_threshold=0.6,
+                       jd_profile: Optional[Dict[str, Any]] = None):
+    if jd_profile is None: jd_profile = build_jd_profile(jd_text, top_k_jd=top_k_jd)
+    jd_phrases = jd_profile["jd_phrases"]
     jd_phrase_pres = check_presence(jd_phrases, resume_text, sim_threshold=sim_threshold)
     
-    jd_tech_flat = flatten_skills(extract_tech_keywords(jd_text))
+    jd_tech_flat = jd_profile["jd_tech_flat"]
     resume_tech_flat = flatten_skills(extract_tech_keywords(resume_text))
     tech_pres = check_presence(jd_tech_flat, resume_text, sim_threshold=sim_threshold)
     
@@ -194,9 +229,9 @@ def evaluate_jd_resume(jd_text: str, resume_text: str, top_k_jd=20, sim_threshol
         "scores": {"overall_keyword_score": round(overall, 2)}
     }
 
-def calculate_keyword_score(resume_text: str, jd_text: str) -> Dict:
+def calculate_keyword_score(resume_text: str, jd_text: str, jd_profile: Optional[Dict[str, Any]] = None) -> Dict:
     if not jd_text.strip() and not resume_text.strip(): return {"keyword_score": 0.0, "missing_skills": []}
-    eval_res = evaluate_jd_resume(jd_text, resume_text)
+    eval_res = evaluate_jd_resume(jd_text, resume_text, jd_profile=jd_profile)
     
     tech_un = eval_res["tech_presence"]["unmatched"]
     phrase_un = eval_res["jd_phrase_presence"]["unmatched"]
@@ -209,11 +244,19 @@ def calculate_keyword_score(resume_text: str, jd_text: str) -> Dict:
     }
 
 # --- MAIN EXPORT ---
-def calculate_ats_analysis(resume_text: str, jd_text: str) -> Dict[str, Any]:
-    sem = float(calculate_semantic_score(resume_text, jd_text))
-    fmt = float(calculate_format_score(resume_text))
-    exp = float(calculate_experience_score(resume_text))
-    kw_data = calculate_keyword_score(resume_text, jd_text)
+def calculate_ats_analysis(resume_text: str, jd_text: str, jd_profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    # One embedding cache per analysis: resume, JD and chunks are encoded once across scorers
+    with embedding_context() as emb_cache:
+        if jd_profile and jd_profile.get("jd_embedding") is not None:
+            emb_cache.put(jd_text, jd_profile["jd_embedding"])
+        with span("score.semantic"):
+            sem = float(calculate_semantic_score(resume_text, jd_text))
+        with span("score.format"):
+            fmt = float(calculate_format_score(resume_text))
+        with span("score.experience"):
+            exp = float(calculate_experience_score(resume_text))
+        with span("score.keyword"):
+            kw_data = calculate_keyword_score(resume_text, jd_text, jd_profile=jd_profile)
     
     kw_score = float(kw_data["keyword_score"])
     weights = {"keyword": 0.4, "semantic": 0.3, "format": 0.2, "experience": 0.1}
@@ -250,6 +293,43 @@ def calculate_ats_analysis(resume_text: str, jd_text: str) -> Dict[str, Any]:
         "missing_skills": kw_data["missing_skills"],
         "meta": {
             "resume_word_count": len(resume_text.split()),
-            "jd_word_count": len(jd_text.split())
+            "jd_word_count": len(jd_text.split()),
+            "embedding_cache": emb_cache.stats()
         }
-    }
\ No newline at end of file
+    }
+
+# --- BULK RANKING ---
+def rank_resumes(resumes: Dict[str, str], jd_text: str, jd_profile: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Score many resumes against one JD, best first.
+
+    JD phrases / tech skills are extracted once, and every resume, chunk and JD keyword is
+    embedded up front in large batches; the per-resume scorers then only hit the shared cache.
+    """
+    with embedding_context() as emb_cache:
+        if jd_profile is None: jd_profile = build_jd_profile(jd_text)
+        if jd_profile.get("jd_embedding") is not None:
+            emb_cache.put(jd_text, jd_profile["jd_embedding"])
+
+        texts = [jd_text] + [kw.lower().strip() for kw in jd_profile["jd_phrases"] + jd_profile["jd_tech_flat"]]
+        for resume_text in resumes.values():
+            texts.append(resume_text)
+            if chunk_index is None or not chunk_index.contains(resume_text):
+                texts.extend(_chunk_text(resume_text))
+        encode_texts([t for t in dict.fromkeys(texts) if t])
+
+        ranked = []
+        for resume_id, resume_text in resumes.items():
+            res = calculate_ats_analysis(resume_text, jd_text, jd_profile=jd_profile)
+            ranked.append({
+                "id": resume_id,
+                "ats_score": res["ats_score"],
+                "ats_band": res["ats_band"],
+                "scores": res["scores"],
+                "missing_skills": res["missing_skills"],
+                "meta": {"resume_word_count": res["meta"]["resume_word_count"]},
+            })
+
+    ranked.sort(key=lambda r: r["ats_score"], reverse=True)
+    for i, r in enumerate(ranked, 1):
+        r["rank"] = i
+    return ranked
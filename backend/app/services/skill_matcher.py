@@ -0,0 +1,101 @@
+# backend/app/services/skill_matcher.py
+
+from collections import deque
+from typing import Dict, List, Tuple
+
+from app.data.skills import TECH_SKILLS, ALIASES, FLAT_SKILLS
+
+_WORD_CHARS = set("abcdefghijklmnopqrstuvwxyz0123456789")
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over every skill and alias in the taxonomy.
+
+    Built once; `find` walks the text a single time and reports every
+    (possibly overlapping) occurrence whose edges sit on a word boundary.
+    """
+
+    def __init__(self, flat_skills: Dict[str, str], aliases: Dict[str, str], tech_skills: Dict[str, List[str]]):
+        self.categories = list(tech_skills.keys())
+
+        # canon -> first category listing it (same precedence as a linear scan)
+        canon_category = {}
+        for cat, items in tech_skills.items():
+            for item in items:
+                canon_category.setdefault(item, cat)
+
+        # skill/alias -> (canon, category) resolved up front
+        self.targets: Dict[str, Tuple[str, str]] = {}
+        for skill, cat in flat_skills.items():
+            canon = aliases.get(skill, skill)
+            self.targets[skill] = (canon, canon_category.get(canon) or cat)
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+        for skill in self.targets:
+            if skill:
+                self._add(skill)
+        self._build_links()
+
+    def _add(self, word: str) -> None:
+        node = 0
+        for ch in word:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(word)
+
+    def _build_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> set:
+        """Return the set of skills/aliases present in `text` (already lowercased)."""
+        goto, fail, out = self._goto, self._fail, self._out
+        n = len(text)
+        hits = set()
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            if end < n and text[end] in _WORD_CHARS:
+                continue
+            for word in out[node]:
+                if word in hits:
+                    continue
+                start = end - len(word)
+                if start > 0 and text[start - 1] in _WORD_CHARS:
+                    continue
+                hits.add(word)
+        return hits
+
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        found = {cat: set() for cat in self.categories}
+        found["other"] = set()
+        for skill in self.find(text):
+            canon, cat = self.targets[skill]
+            found[cat].add(canon)
+        return {cat: sorted(list(vals)) for cat, vals in found.items() if vals}
+
+
+# Global instance to import
+skill_matcher = SkillMatcher(FLAT_SKILLS, ALIASES, TECH_SKILLS)
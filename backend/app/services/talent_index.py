@@ -0,0 +1,170 @@
+# backend/app/services/talent_index.py
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional, Set
+
+import numpy as np
+
+from app.config import TALENT_INDEX_DIR, SBERT_MODEL_NAME, EMBEDDING_BACKEND
+from app.data.skills import ALIASES
+from app.services.embeddings import encode_texts, normalize_rows
+from app.services.scoring import extract_tech_keywords, flatten_skills
+
+
+def canonical_skill(skill: str) -> str:
+    s = (skill or "").strip().lower()
+    return ALIASES.get(s, s)
+
+
+class TalentIndex:
+    """Exact vector index over stored resumes plus a skill -> resume inverted index.
+
+    On disk (one directory per model/backend): `vectors.f32` holds normalized float32 rows
+    in ingestion order, `records.jsonl` one record per ingested resume naming its vector `row`.
+    A vector is written before its record, so a failure in between leaves an unreferenced row
+    that is skipped, never a record paired with someone else's vector. Re-ingesting an id
+    adds a new row; the newest record wins and older ones are ignored on load. In memory the
+    rows live in a buffer that doubles when full, so ingestion is amortized O(1) per resume.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = os.path.join(directory, f"{SBERT_MODEL_NAME}-{EMBEDDING_BACKEND}".replace("/", "_"))
+        self._vec_path = os.path.join(self.directory, "vectors.f32")
+        self._rec_path = os.path.join(self.directory, "records.jsonl")
+        self._lock = threading.Lock()
+        self._buf = np.zeros((0, 0), dtype=np.float32)  # capacity rows; the first self._n are written
+        self._n = 0
+        self._records: Dict[int, Dict[str, Any]] = {}  # by vector row
+        self._live: Dict[str, int] = {}            # resume id -> current row
+        self._by_skill: Dict[str, Set[int]] = {}   # canonical skill -> live rows
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    # --- persistence ---
+    def _load(self) -> None:
+        if not os.path.exists(self._rec_path): return
+        records = []
+        with open(self._rec_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # blank or torn line
+        if not records: return
+        dim = records[0]["dim"]
+        raw = np.fromfile(self._vec_path, dtype=np.float32) if os.path.exists(self._vec_path) else np.zeros(0, np.float32)
+        self._n = raw.size // dim  # a torn trailing vector is ignored and overwritten by the next ingest
+        self._buf = raw[: self._n * dim].reshape(self._n, dim)
+        for i, rec in enumerate(records):
+            row = rec.get("row", i)  # records written before rows were stored: one per vector, in order
+            if row < self._n:
+                self._index_row(row, rec)
+
+    def _index_row(self, row: int, rec: Dict[str, Any]) -> None:
+        old = self._live.get(rec["id"])
+        if old is not None:
+            for skill in self._records[old]["skills"]:
+                self._by_skill.get(skill, set()).discard(old)
+        self._records[row] = rec
+        self._live[rec["id"]] = row
+        for skill in rec["skills"]:
+            self._by_skill.setdefault(skill, set()).add(row)
+
+    def _append_vector(self, vec: np.ndarray) -> None:
+        n = self._n
+        if n == self._buf.shape[0]:
+            grown = np.empty((max(1024, 2 * n), vec.shape[0]), dtype=np.float32)
+            if n: grown[:n] = self._buf[:n]
+            self._buf = grown  # searches holding a view of the old buffer stay valid
+        self._buf[n] = vec
+        self._n += 1
+
+    # --- ingestion ---
+    def ingest(self, resume_id: str, resume_text: str, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        vec = normalize_rows(encode_texts([resume_text]))[0]
+        skills = flatten_skills(extract_tech_keywords(resume_text))
+        rec = {
+            "id": resume_id, "skills": skills, "dim": int(vec.shape[0]),
+            "word_count": len(resume_text.split()), "ingested_at": time.time(), "meta": meta or {},
+        }
+        with self._lock:
+            if self._n and self._buf.shape[1] != vec.shape[0]:
+                raise ValueError("Embedding dimension changed; use a fresh TALENT_INDEX_DIR")
+            row = self._n
+            data = np.ascontiguousarray(vec, dtype=np.float32).tobytes()
+            # at the row's own offset, so a torn earlier write cannot shift later rows
+            with open(self._vec_path, "r+b" if os.path.exists(self._vec_path) else "wb") as f:
+                f.seek(row * len(data))
+                f.write(data)
+            self._append_vector(vec)  # the row is taken even if the record write below fails
+            rec["row"] = row
+            with open(self._rec_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(rec) + "\n")
+            self._index_row(row, rec)
+        return {"id": resume_id, "skills": skills, "word_count": rec["word_count"]}
+
+    # --- query ---
+    def search(self, jd_text: Optional[str] = None, required_skills: Optional[List[str]] = None,
+               top_k: int = 20, jd_embedding=None) -> Dict[str, Any]:
+        """Resumes having every required skill, ranked by the semantic-score similarity
+        (cosine of whole-resume and JD embeddings, x100) to the JD."""
+        t0 = time.perf_counter()
+        q = normalize_rows(jd_embedding if jd_embedding is not None else encode_texts([jd_text]))[0]
+        required = sorted({canonical_skill(s) for s in (required_skills or []) if s and s.strip()})
+
+        with self._lock:
+            vectors = self._buf[:self._n]
+            if required:
+                rows = set(self._by_skill.get(required[0], set()))
+                for skill in required[1:]:
+                    rows &= self._by_skill.get(skill, set())
+                rows = np.fromiter(sorted(rows), dtype=np.int64)
+            else:
+                rows = np.fromiter(sorted(self._live.values()), dtype=np.int64)
+            records = self._records
+
+        if rows.size == 0 or vectors.size == 0:
+            return {"results": [], "candidates": 0, "required_skills": required,
+                    "elapsed_ms": round((time.perf_counter() - t0) * 1000, 2)}
+
+        sims = vectors[rows] @ q
+        k = min(top_k, rows.size)
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+
+        results = []
+        for i in top:
+            rec = records[int(rows[i])]
+            results.append({
+                "id": rec["id"],
+                "semantic_score": round(max(0.0, min(float(sims[i]) * 100, 100.0)), 2),
+                "skills": rec["skills"],
+                "word_count": rec["word_count"],
+                "meta": rec["meta"],
+            })
+        return {"results": results, "candidates": int(rows.size), "required_skills": required,
+                "elapsed_ms": round((time.perf_counter() - t0) * 1000, 2)}
+
+    def stats(self) -> Dict[str, Any]:
+        return {"resumes": len(self._live), "rows": self._n, "skills": len(self._by_skill),
+                "directory": self.directory}
+
+
+_talent_index: Optional[TalentIndex] = None
+_talent_index_lock = threading.Lock()
+
+def get_talent_index() -> TalentIndex:
+    """Opened on first use so app startup does not read the whole index."""
+    global _talent_index
+    if _talent_index is None:
+        with _talent_index_lock:
+            if _talent_index is None:
+                _talent_index = TalentIndex(TALENT_INDEX_DIR)
+    return _talent_index
+
+def loaded_talent_index() -> Optional[TalentIndex]:
+    """The index if something already opened it; never reads from disk (safe on the event loop)."""
+    return _talent_index
@@ -0,0 +1,242 @@
+# backend/app/services/upstream.py
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from app.config import (
+    LLM_CALL_TIMEOUT, LLM_RATE_PER_MIN, LLM_BURST,
+    OCR_CALL_TIMEOUT, OCR_RATE_PER_MIN, OCR_BURST,
+    UPSTREAM_BACKOFF_BASE, UPSTREAM_BACKOFF_MAX, BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN,
+    LLM_PROVIDER, OCR_PROVIDER,
+)
+from app.services.providers import ReplayMiss
+
+
+class UpstreamError(Exception):
+    """An upstream call was not made (or abandoned) by this layer rather than failed remotely."""
+
+class CircuitOpen(UpstreamError):
+    pass
+
+class DeadlineExceeded(UpstreamError):
+    pass
+
+
+# --- RATE LIMIT ---
+class TokenBucket:
+    """`rate_per_min` calls per minute on average, bursts of up to `burst`; rate <= 0 disables it.
+
+    A caller that finds the bucket empty reserves the next token (the level goes negative)
+    and sleeps until it is due, so waiters are served in arrival order.
+    """
+
+    def __init__(self, rate_per_min: float, burst: int):
+        self.rate = rate_per_min / 60.0
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.waited_s = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: Optional[float] = None) -> bool:
+        """Take a token, sleeping if needed; False (nothing taken) if it would only come after `deadline`."""
+        if self.rate <= 0: return True
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            self.tokens -= 1
+            self.waited_s += wait
+        if wait: time.sleep(wait)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate_per_min": round(self.rate * 60, 2) if self.rate > 0 else None,
+                "burst": int(self.capacity),
+                "tokens": round(self.tokens, 2),
+                "waited_s": round(self.waited_s, 3),
+            }
+
+
+# --- CIRCUIT BREAKER ---
+class CircuitBreaker:
+    """closed -> open after `threshold` consecutive failures; after `cooldown` seconds one probe
+    is let through (half_open) and its outcome closes or re-opens the circuit. threshold <= 0 disables it."""
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _cooled_down(self) -> bool:
+        return time.monotonic() - self._opened_at >= self.cooldown
+
+    def available(self) -> bool:
+        """Would a call be let through right now? (Does not claim the half-open probe.)"""
+        with self._lock:
+            if self.state == "closed": return True
+            if self.state == "open": return self._cooled_down()
+            return not self._probing
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed": return True
+            if self.state == "open" and self._cooled_down():
+                self.state, self._probing = "half_open", False
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state, self.failures, self._probing = "closed", 0, False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.threshold <= 0: return
+            if self.state == "half_open" or self.failures >= self.threshold:
+                if self.state != "open":
+                    self.opened += 1
+                self.state, self._opened_at, self._probing = "open", time.monotonic(), False
+
+    def release(self) -> None:
+        """The call proved nothing about the upstream; give the probe slot back."""
+        with self._lock:
+            self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = max(0.0, self._opened_at + self.cooldown - time.monotonic()) if self.state == "open" else 0.0
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "times_opened": self.opened,
+                "retry_in_s": round(retry_in, 1),
+            }
+
+
+# --- CLIENT ---
+class UpstreamClient:
+    """Everything between our code and one remote API: rate limit, circuit breaker, deadlines
+    and exponential backoff with full jitter. Exceptions in `neutral` (e.g. a replay miss) are
+    re-raised without counting against the upstream's health."""
+
+    def __init__(self, name: str, rate_per_min: float, burst: int, timeout_s: float,
+                 failure_threshold: int = BREAKER_FAILURE_THRESHOLD, cooldown_s: float = BREAKER_COOLDOWN,
+                 backoff_base: float = UPSTREAM_BACKOFF_BASE, backoff_max: float = UPSTREAM_BACKOFF_MAX,
+                 neutral: Tuple[Type[BaseException], ...] = ()):
+        self.name = name
+        self.bucket = TokenBucket(rate_per_min, burst)
+        self.breaker = CircuitBreaker(failure_threshold, cooldown_s)
+        self.timeout_s = timeout_s
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.neutral = neutral
+        self.counts = {"calls": 0, "ok": 0, "failed": 0, "retries": 0,
+                       "short_circuited": 0, "rate_limited": 0, "deadline_exceeded": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    def deadline(self, timeout: Optional[float] = None) -> float:
+        return time.monotonic() + (self.timeout_s if timeout is None else timeout)
+
+    def available(self) -> bool:
+        return self.breaker.available()
+
+    @contextmanager
+    def attempt(self, deadline: Optional[float] = None):
+        """Guard one call and yield the seconds it may take. Raises CircuitOpen / DeadlineExceeded
+        without calling; an exception from the block counts as an upstream failure."""
+        deadline = self.deadline() if deadline is None else deadline
+        if not self.breaker.available():
+            self._count("short_circuited")
+            raise CircuitOpen(f"{self.name}: circuit open")
+        if not self.bucket.acquire(deadline):
+            self._count("rate_limited")
+            raise DeadlineExceeded(f"{self.name}: no rate-limit token before the deadline")
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._count("deadline_exceeded")
+            raise DeadlineExceeded(f"{self.name}: deadline passed")
+        if not self.breaker.allow():  # another caller took the half-open probe
+            self._count("short_circuited")
+            raise CircuitOpen(f"{self.name}: circuit open")
+
+        self._count("calls")
+        try:
+            yield remaining
+        except self.neutral:
+            self.breaker.release()
+            raise
+        except Exception as e:
+            self._count("deadline_exceeded" if isinstance(e, (DeadlineExceeded, TimeoutError)) else "failed")
+            self.breaker.record_failure()
+            raise
+        else:
+            self._count("ok")
+            self.breaker.record_success()
+
+    def backoff(self, attempt: int, deadline: float) -> bool:
+        """Sleep before retry number `attempt + 1`; False (no sleep) if the retry could not finish in time."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if time.monotonic() + delay >= deadline:
+            return False
+        self._count("retries")
+        time.sleep(delay)
+        return True
+
+    def call(self, fn: Callable, *args, attempts: int = 1, deadline: Optional[float] = None, **kwargs):
+        """fn(*args, timeout=<seconds left>, **kwargs) under `attempt`, retried with backoff."""
+        deadline = self.deadline() if deadline is None else deadline
+        for attempt in range(attempts):
+            try:
+                with self.attempt(deadline) as remaining:
+                    return fn(*args, timeout=remaining, **kwargs)
+            except (UpstreamError,) + self.neutral:
+                raise
+            except Exception:
+                if attempt == attempts - 1 or not self.backoff(attempt, deadline):
+                    raise
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self.counts)
+        return {
+            "available": self.available(),
+            **self.breaker.stats(),
+            "timeout_s": self.timeout_s,
+            "rate_limit": self.bucket.stats(),
+            **counts,
+        }
+
+
+# Quotas belong to the live APIs; fake and replay providers never reach them and must not be throttled
+# (the load test and benchmarks measure our own code through them)
+LIVE_LLM_PROVIDERS = ("gemini", "record")
+LIVE_OCR_PROVIDERS = ("llmwhisperer", "record")
+
+llm_upstream = UpstreamClient("llm", LLM_RATE_PER_MIN if LLM_PROVIDER in LIVE_LLM_PROVIDERS else 0,
+                              LLM_BURST, LLM_CALL_TIMEOUT, neutral=(ReplayMiss,))
+ocr_upstream = UpstreamClient("ocr", OCR_RATE_PER_MIN if OCR_PROVIDER in LIVE_OCR_PROVIDERS else 0,
+                              OCR_BURST, OCR_CALL_TIMEOUT, neutral=(ReplayMiss,))
+
+def upstream_status() -> Dict[str, Any]:
+    return {"llm": llm_upstream.status(), "ocr": ocr_upstream.status()}
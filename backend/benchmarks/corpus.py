@@ -0,0 +1,156 @@
+# backend/benchmarks/corpus.py
+"""Deterministic synthetic resume / JD corpus built from the skill taxonomy in app/data/skills.py.
+
+Run from backend/:  python -m benchmarks.corpus --n 30 --seed 7 --out corpus.json
+
+Each item varies resume length (short / medium / long) and skill density (share of
+lines naming a skill). JDs ask for a mix of skills the resume has (sometimes under an
+alias) and skills it lacks, so exact, token and semantic matching paths are all hit.
+The same seed always yields the same corpus.
+"""
+
+import argparse
+import json
+import random
+from typing import Dict, List
+
+from app.data.skills import TECH_SKILLS, ALIASES
+
+# target resume length in words
+SIZES = {"short": 150, "medium": 450, "long": 1200}
+# share of experience lines that mention at least one skill
+DENSITIES = {"low": 0.15, "medium": 0.4, "high": 0.75}
+
+VERBS = ["Built", "Designed", "Developed", "Led", "Optimized", "Managed", "Created", "Analyzed", "Migrated", "Automated"]
+OBJECTS = [
+    "a customer-facing dashboard", "the billing service", "an internal data pipeline", "a recommendation engine",
+    "the CI/CD workflow", "a mobile onboarding flow", "an event-driven order system", "the reporting layer",
+    "a search API", "a fraud detection model", "the authentication service", "an inventory tracker",
+]
+OUTCOMES = [
+    "reducing latency by {n}%", "serving {n}k daily users", "cutting infrastructure cost by {n}%",
+    "improving conversion by {n}%", "shortening release cycles by {n}%", "with {n}% test coverage",
+]
+FILLER = [
+    "Collaborated with product managers and designers to refine requirements",
+    "Mentored junior engineers and ran weekly code reviews",
+    "Wrote technical documentation and onboarding guides",
+    "Presented quarterly results to stakeholders",
+    "Participated in on-call rotation and incident reviews",
+    "Worked closely with the QA team to stabilize releases",
+]
+JD_INTRO = [
+    "We are looking for a {role} to join our growing platform team.",
+    "Our company is hiring a {role} to build reliable, scalable products.",
+    "As a {role} you will own services end to end in a fast-moving environment.",
+]
+JD_DUTIES = [
+    "Design and maintain production services with strong observability.",
+    "Partner with cross-functional teams to deliver customer value.",
+    "Drive technical decisions and mentor other engineers.",
+    "Improve performance, reliability and cost efficiency of our systems.",
+    "Translate business requirements into clean, testable code.",
+]
+ROLES = ["Backend Engineer", "Data Engineer", "ML Engineer", "Frontend Developer", "DevOps Engineer", "Full Stack Developer"]
+
+# canonical skill -> aliases that map to it, so resumes sometimes use the alternate spelling
+_ALIASES_OF: Dict[str, List[str]] = {}
+for _alias, _canon in ALIASES.items():
+    _ALIASES_OF.setdefault(_canon, []).append(_alias)
+
+
+def _skill_pool(rng: random.Random) -> List[str]:
+    """Skills from 2-4 related categories, roughly how a real profile clusters."""
+    cats = rng.sample(list(TECH_SKILLS), k=rng.randint(2, 4))
+    pool = sorted({s for c in cats for s in TECH_SKILLS[c] if len(s) > 1})
+    rng.shuffle(pool)
+    return pool
+
+def _mention(skill: str, rng: random.Random) -> str:
+    aliases = _ALIASES_OF.get(skill)
+    return rng.choice(aliases) if aliases and rng.random() < 0.3 else skill
+
+def _experience_line(rng: random.Random, skills: List[str], density: float) -> str:
+    line = f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)}"
+    if skills and rng.random() < density:
+        used = rng.sample(skills, k=min(len(skills), rng.randint(1, 3)))
+        line += " using " + ", ".join(_mention(s, rng) for s in used)
+    if rng.random() < 0.6:
+        line += ", " + rng.choice(OUTCOMES).format(n=rng.randint(5, 80))
+    return line + "."
+
+def make_resume(rng: random.Random, size: str, density: str) -> Dict[str, object]:
+    target_words = SIZES[size]
+    pool = _skill_pool(rng)
+    skills = pool[: max(4, int(len(pool) * DENSITIES[density]))]
+
+    lines = [
+        f"Candidate {rng.randint(1000, 9999)} | candidate{rng.randint(1, 999)}@example.com | +1 555{rng.randint(1000000, 9999999)}",
+        "EXPERIENCE",
+    ]
+    words = sum(len(l.split()) for l in lines)
+    while words < target_words * 0.8:
+        line = _experience_line(rng, skills, DENSITIES[density]) if rng.random() < 0.8 else f"- {rng.choice(FILLER)}."
+        lines.append(line)
+        words += len(line.split())
+    lines += ["PROJECTS", _experience_line(rng, skills, 1.0), "EDUCATION", "B.Tech Computer Science",
+              "SKILLS", ", ".join(_mention(s, rng) for s in skills)]
+    return {"text": "\n".join(lines), "skills": skills}
+
+def make_jd(rng: random.Random, resume_skills: List[str], overlap: float) -> Dict[str, object]:
+    role = rng.choice(ROLES)
+    n_req = rng.randint(6, 12)
+    have = rng.sample(resume_skills, k=min(len(resume_skills), round(n_req * overlap)))
+    others = [s for s in _skill_pool(rng) if s not in resume_skills]
+    lacking = others[: n_req - len(have)]
+    required = have + lacking
+    rng.shuffle(required)
+
+    parts = [rng.choice(JD_INTRO).format(role=role), "Responsibilities:"]
+    parts += [f"- {d}" for d in rng.sample(JD_DUTIES, k=3)]
+    parts.append("Requirements:")
+    parts.append(f"- Strong experience with {', '.join(required[: len(required) // 2])}.")
+    parts.append(f"- Familiarity with {', '.join(required[len(required) // 2:])} is a plus.")
+    parts.append("- Excellent communication and problem solving skills.")
+    return {"text": "\n".join(parts), "required": required}
+
+def generate_corpus(n: int = 30, seed: int = 7) -> List[Dict[str, object]]:
+    """`n` resume/JD pairs cycling through every size x density combination."""
+    rng = random.Random(seed)
+    combos = [(s, d) for s in SIZES for d in DENSITIES]
+    items = []
+    for i in range(n):
+        size, density = combos[i % len(combos)]
+        resume = make_resume(rng, size, density)
+        jd = make_jd(rng, resume["skills"], overlap=rng.choice([0.25, 0.5, 0.75]))
+        items.append({
+            "id": f"{size}-{density}-{i}",
+            "size": size,
+            "density": density,
+            "resume": resume["text"],
+            "jd": jd["text"],
+            "resume_skills": resume["skills"],
+            "jd_required": jd["required"],
+        })
+    return items
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--n", type=int, default=30)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--out", help="write the corpus as JSON to this path")
+    args = ap.parse_args()
+
+    items = generate_corpus(args.n, args.seed)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(items, f, indent=2)
+    else:
+        print(json.dumps(items[0], indent=2))
+    words = [len(it["resume"].split()) for it in items]
+    print(f"{len(items)} pairs, resume words min/mean/max = {min(words)}/{sum(words) // len(words)}/{max(words)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# backend/benchmarks/embedding_backends.py
+"""Accuracy parity and throughput of the embedding backends against full-precision PyTorch.
+
+Run from backend/:  python -m benchmarks.embedding_backends [--backends torch-int8 onnx onnx-int8]
+
+Parity: cosine between each backend's embedding and the torch embedding of the same
+text (resume chunks, JD phrases, whole documents), plus the change in the resume/JD
+semantic score (the value calculate_semantic_score reports) for sample pairs.
+Exits non-zero if any backend falls below --min-cosine or exceeds --max-score-delta.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from app.services.ai_models import build_sentence_model
+from app.services.embeddings import normalize_rows
+from app.services.scoring import _chunk_text
+
+PAIRS = [
+    (
+        """Jane Doe | jane@example.com
+EXPERIENCE
+- Built REST APIs in Python (FastAPI, Django) serving 2M requests/day.
+- Designed PostgreSQL schemas and cut p95 query latency by 60%.
+- Led migration of services to Docker and Kubernetes on AWS.
+PROJECTS
+- Real-time analytics pipeline with Kafka and Spark.
+SKILLS: Python, SQL, Docker, Kubernetes, AWS, React""",
+        """Backend Engineer: build scalable microservices in Python and Go. Experience with Kafka,
+Kubernetes, Terraform and GCP required; Prometheus, Grafana and CI/CD a plus.""",
+    ),
+    (
+        """Data Scientist with 4 years of experience. Trained gradient boosting and deep learning
+models with scikit-learn, PyTorch and TensorFlow. Deployed models with MLflow on Azure.
+Wrote ETL jobs in Airflow; dashboards in Tableau. MSc Statistics.""",
+        """We need an ML Engineer to productionize NLP models (BERT, transformers, Hugging Face),
+own feature pipelines on Spark/Databricks and MLOps tooling. Python and SQL required.""",
+    ),
+    (
+        """Frontend developer. React, Next.js, TypeScript, Tailwind CSS. Built a design system used by
+12 product teams, improved Lighthouse scores from 55 to 95. Jest and Cypress testing.""",
+        """Senior Java developer for payments: Spring Boot, Hibernate, Oracle, Kafka; microservices on
+OpenShift. Strong knowledge of concurrency and JVM tuning.""",
+    ),
+]
+
+PHRASES = ["kafka", "kubernetes", "system design", "stakeholder management", "ci/cd pipelines",
+           "hugging face", "spring boot", "data visualization", "cloud infrastructure", "leadership"]
+
+
+def corpus():
+    texts = []
+    for resume, jd in PAIRS:
+        texts += [resume, jd] + _chunk_text(resume) + _chunk_text(jd)
+    return texts + PHRASES
+
+
+def semantic_scores(model):
+    out = []
+    for resume, jd in PAIRS:
+        e = normalize_rows(model.encode([resume, jd]))
+        out.append(max(0.0, min(float(e[0] @ e[1]) * 100, 100.0)))
+    return np.array(out)
+
+
+def throughput(model, texts, repeats):
+    model.encode(texts)  # warmup
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        model.encode(texts)
+    elapsed = time.perf_counter() - t0
+    return round(len(texts) * repeats / elapsed, 1)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--backends", nargs="+", default=["torch-int8", "onnx", "onnx-int8"])
+    ap.add_argument("--repeats", type=int, default=20)
+    ap.add_argument("--min-cosine", type=float, default=0.98)
+    ap.add_argument("--max-score-delta", type=float, default=2.0, help="max |semantic score change| in points")
+    ap.add_argument("--out", help="write results as JSON to this path")
+    args = ap.parse_args()
+
+    texts = corpus()
+    reference = build_sentence_model("torch")
+    ref_emb = normalize_rows(reference.encode(texts))
+    ref_scores = semantic_scores(reference)
+
+    results = [{"backend": "torch", "texts_per_s": throughput(reference, texts, args.repeats)}]
+    ok = True
+    for backend in args.backends:
+        try:
+            model = build_sentence_model(backend)
+        except Exception as e:
+            results.append({"backend": backend, "error": f"{type(e).__name__}: {e}"})
+            continue
+        cos = (normalize_rows(model.encode(texts)) * ref_emb).sum(axis=1)
+        delta = np.abs(semantic_scores(model) - ref_scores)
+        passed = bool(cos.min() >= args.min_cosine and delta.max() <= args.max_score_delta)
+        ok = ok and passed
+        results.append({
+            "backend": backend,
+            "texts_per_s": throughput(model, texts, args.repeats),
+            "cosine_min": round(float(cos.min()), 5),
+            "cosine_mean": round(float(cos.mean()), 5),
+            "semantic_score_max_delta": round(float(delta.max()), 3),
+            "parity": "pass" if passed else "fail",
+        })
+
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
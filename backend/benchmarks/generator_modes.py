@@ -0,0 +1,127 @@
+# backend/benchmarks/generator_modes.py
+"""Compare the five-call and mega-prompt generator modes.
+
+Run from backend/:  python -m benchmarks.generator_modes --runs 5 [--resume r.txt --jd jd.txt]
+
+Reports per mode: upstream calls, estimated input/output tokens (chars / 4),
+end-to-end latency and the share of sections that came back empty.
+The LLM response cache is disabled so every run pays its real calls.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+
+os.environ["LLM_CACHE_ENABLED"] = "0"
+
+from app.services import generator  # noqa: E402
+
+SAMPLE_RESUME = """Jane Doe | jane@example.com | +1 5551234567
+EXPERIENCE
+- Built REST APIs in Python (FastAPI, Django) serving 2M requests/day.
+- Designed PostgreSQL schemas and optimized slow queries by 60%.
+- Led migration of services to Docker and Kubernetes on AWS.
+PROJECTS
+- Real-time analytics pipeline with Kafka and Spark.
+EDUCATION
+B.Tech Computer Science
+SKILLS
+Python, SQL, Docker, Kubernetes, AWS, React"""
+
+SAMPLE_JD = """We are hiring a Backend Engineer to build scalable microservices in Python and Go.
+Experience with Kafka, Kubernetes, Terraform and GCP is required. Familiarity with
+observability tooling (Prometheus, Grafana) and CI/CD is a plus."""
+
+SAMPLE_MISSING = ["go", "terraform", "gcp", "prometheus", "cicd"]
+
+
+class CallRecorder:
+    """Wraps get_raw_llm_response / get_llm_stream to count calls and prompt/response sizes."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.prompt_chars = 0
+        self.response_chars = 0
+
+    def install(self):
+        inner = generator.get_raw_llm_response
+
+        def recorded(prompt, timeout=None):
+            text = inner(prompt, timeout)
+            with self.lock:
+                self.calls += 1
+                self.prompt_chars += len(prompt)
+                self.response_chars += len(text or "")
+            return text
+
+        generator.get_raw_llm_response = recorded
+
+        inner_stream = generator.get_llm_stream
+
+        def recorded_stream(prompt, timeout=None):
+            with self.lock:
+                self.calls += 1
+                self.prompt_chars += len(prompt)
+            for piece in inner_stream(prompt, timeout):
+                with self.lock:
+                    self.response_chars += len(piece)
+                yield piece
+
+        generator.get_llm_stream = recorded_stream
+
+
+def run_mode(mode: str, runs: int, resume: str, jd: str, missing, recorder: CallRecorder) -> dict:
+    latencies, calls, tok_in, tok_out, empty = [], [], [], [], 0
+    for _ in range(runs):
+        recorder.reset()
+        t0 = time.perf_counter()
+        out = generator.run_all_and_normalize(resume, jd, missing, mode=mode)
+        latencies.append(time.perf_counter() - t0)
+        calls.append(recorder.calls)
+        tok_in.append(recorder.prompt_chars / 4)
+        tok_out.append(recorder.response_chars / 4)
+        empty += sum(1 for key in generator.SECTION_REQUIRED_KEYS if not out.get(key))
+
+    return {
+        "mode": mode,
+        "runs": runs,
+        "calls_per_run": statistics.mean(calls),
+        "est_input_tokens": round(statistics.mean(tok_in)),
+        "est_output_tokens": round(statistics.mean(tok_out)),
+        "latency_s_mean": round(statistics.mean(latencies), 3),
+        "latency_s_max": round(max(latencies), 3),
+        "empty_section_rate": round(empty / (runs * len(generator.SECTION_REQUIRED_KEYS)), 3),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--resume", help="path to a resume text file")
+    ap.add_argument("--jd", help="path to a JD text file")
+    ap.add_argument("--out", help="write results as JSON to this path")
+    args = ap.parse_args()
+
+    resume = open(args.resume, encoding="utf-8").read() if args.resume else SAMPLE_RESUME
+    jd = open(args.jd, encoding="utf-8").read() if args.jd else SAMPLE_JD
+
+    recorder = CallRecorder()
+    recorder.install()
+    results = [run_mode(mode, args.runs, resume, jd, SAMPLE_MISSING, recorder) for mode in ("multi", "mega")]
+    results[1]["mega_stats"] = dict(generator.mega_stats)
+
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
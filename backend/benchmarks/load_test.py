@@ -0,0 +1,141 @@
+# backend/benchmarks/load_test.py
+"""Concurrent /analyze load test against local stand-ins for Gemini and LLMWhisperer.
+
+Run from backend/:
+    python -m benchmarks.load_test --concurrency 8 --requests 200
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --concurrency 16 --duration 60
+
+Without --url the app runs in this process (httpx ASGI transport) with LLM_PROVIDER and
+OCR_PROVIDER defaulting to "fake", so upstream latency is the fixed, configurable
+FAKE_*_LATENCY_MS (set both to 0 to measure our own code alone) and results are
+repeatable. Fake and replay providers bypass the upstream rate limiters (LLM_RATE_PER_MIN,
+OCR_RATE_PER_MIN), so the numbers are not capped by the Gemini/LLMWhisperer quotas; the
+report's "rate_limits" shows what the server applied. Against --url, start the server with
+the same variables, or with "replay" and a PROVIDER_REPLAY_DIR recorded earlier with "record".
+
+Requests cycle through the synthetic corpus from benchmarks.corpus; the resume text is
+sent as the upload (the fake OCR returns it as-is). --vary-jd appends a request number to
+every JD so the JD-profile and LLM caches never hit.
+
+Reports throughput, latency percentiles per status code, and the server's /stats afterwards.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.stats import latency_summary
+
+
+def _client(url: Optional[str], timeout: float) -> httpx.AsyncClient:
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=timeout)
+    os.environ.setdefault("LLM_PROVIDER", "fake")
+    os.environ.setdefault("OCR_PROVIDER", "fake")
+    os.environ.setdefault("MODEL_PRELOAD", "0")
+    from app.main import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load-test", timeout=timeout)
+
+
+async def _one(client: httpx.AsyncClient, item: Dict, seq: int, endpoint: str, vary_jd: bool, results: List) -> None:
+    jd = f"{item['jd']}\nReq {seq}" if vary_jd else item["jd"]
+    files = {"resume_file": (f"{item['id']}.txt", item["resume"].encode("utf-8"), "text/plain")}
+    t0 = time.perf_counter()
+    try:
+        r = await client.post(endpoint, files=files, data={"jd_text": jd})
+        status = r.status_code
+        if endpoint.endswith("/stream") and status == 200:
+            last = json.loads(r.text.strip().splitlines()[-1])
+            status = 200 if last.get("event") == "done" else last.get("status", 500)
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    results.append((status, (time.perf_counter() - t0) * 1000))
+
+
+async def run(url: Optional[str], concurrency: int, requests: Optional[int], duration: Optional[float],
+              endpoint: str, corpus_n: int, seed: int, vary_jd: bool, warmup: int, timeout: float) -> Dict:
+    corpus = generate_corpus(corpus_n, seed)
+    results: List = []
+    async with _client(url, timeout) as client:
+        # First requests pay model loading; keep them out of the numbers
+        warm: List = []
+        for i in range(warmup):
+            await _one(client, corpus[i % len(corpus)], -1 - i, endpoint, vary_jd, warm)
+
+        counter = iter(range(10 ** 9))
+        stop_at = time.perf_counter() + duration if duration else None
+
+        async def worker():
+            for seq in counter:
+                if requests is not None and seq >= requests: return
+                if stop_at is not None and time.perf_counter() >= stop_at: return
+                await _one(client, corpus[seq % len(corpus)], seq, endpoint, vary_jd, results)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        wall = time.perf_counter() - t0
+
+        try:
+            server_stats = (await client.get("/stats")).json()
+        except Exception as e:
+            server_stats = {"error": str(e)}
+
+    by_status: Dict[str, List[float]] = {}
+    for status, ms in results:
+        by_status.setdefault(str(status), []).append(ms)
+    ok = by_status.get("200", [])
+    return {
+        "config": {
+            "target": url or "in-process", "endpoint": endpoint, "concurrency": concurrency,
+            "requests": requests, "duration_s": duration, "corpus": {"n": corpus_n, "seed": seed},
+            "vary_jd": vary_jd, "llm_provider": os.getenv("LLM_PROVIDER", "(server)"),
+            "ocr_provider": os.getenv("OCR_PROVIDER", "(server)"),
+        },
+        "total": len(results),
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(ok) / wall, 2) if wall else 0.0,
+        "status_counts": dict(Counter(str(s) for s, _ in results)),
+        "latency_ok": latency_summary(ok),
+        "latency_by_status": {s: latency_summary(v) for s, v in by_status.items() if s != "200"},
+        "rate_limits": {name: (server_stats.get("upstream") or {}).get(name, {}).get("rate_limit")
+                        for name in ("llm", "ocr")},
+        "server_stats": server_stats,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", help="base URL of a running server (default: run the app in-process)")
+    ap.add_argument("--endpoint", default="/analyze", choices=["/analyze", "/analyze/stream"])
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--requests", type=int, help="total requests (default 100 unless --duration is given)")
+    ap.add_argument("--duration", type=float, help="run for this many seconds instead of a fixed count")
+    ap.add_argument("--corpus-n", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--vary-jd", action="store_true", help="make every JD unique to defeat the JD/LLM caches")
+    ap.add_argument("--warmup", type=int, default=2)
+    ap.add_argument("--timeout", type=float, default=120.0)
+    ap.add_argument("--out", help="write results as JSON to this path")
+    args = ap.parse_args()
+
+    requests = args.requests if args.requests is not None or args.duration else 100
+    report = asyncio.run(run(args.url, args.concurrency, requests, args.duration, args.endpoint,
+                             args.corpus_n, args.seed, args.vary_jd, args.warmup, args.timeout))
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if not report["status_counts"].get("200"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# backend/benchmarks/scoring_bench.py
+"""Latency, throughput and peak memory of the scoring engine over a synthetic corpus.
+
+Run from backend/:
+    python -m benchmarks.scoring_bench --n 30 --repeat 3 --out bench.json
+    python -m benchmarks.scoring_bench --n 30 --repeat 3 --compare bench.json --max-regression 15
+
+Targets: extract_tech_keywords, check_presence, evaluate_jd_resume, calculate_ats_analysis
+and (with --targets run_analysis) the whole pipeline. Gemini and OCR are replaced by local
+stubs so nothing leaves the machine; the SBERT/KeyBERT models are the real ones and must be
+available locally (MODEL_DIR or the Hugging Face cache). The LLM response cache and the
+persistent chunk index are disabled so every repeat does the same work, and so is the
+Gemini rate limiter (the stub has no quota).
+
+Per target: p50/p90/p95/p99/mean/max latency (ms), calls/s, and peak Python heap during
+one extra pass under tracemalloc (native tensor buffers are not counted). With --compare,
+each target's p50/p95/throughput is diffed against a previous JSON run; the exit code is 1
+if any p95 regressed by more than --max-regression percent.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+os.environ["LLM_CACHE_ENABLED"] = "0"
+os.environ["CHUNK_INDEX_ENABLED"] = "0"
+os.environ["LLM_STREAMING"] = "0"  # the stub below replaces the whole-reply call
+os.environ["LLM_RATE_PER_MIN"] = "0"  # the stub is not Gemini; the quota limiter would only add waits
+
+from app.config import SBERT_MODEL_NAME, EMBEDDING_BACKEND  # noqa: E402
+from app.services import generator, pipeline  # noqa: E402
+from app.services.ai_models import ai_loader  # noqa: E402
+from app.services.scoring import (  # noqa: E402
+    extract_tech_keywords, check_presence, evaluate_jd_resume, calculate_ats_analysis,
+    build_jd_profile,
+)
+from benchmarks.corpus import generate_corpus  # noqa: E402
+from benchmarks.stats import latency_summary  # noqa: E402
+
+TARGETS = ["extract_tech_keywords", "check_presence", "evaluate_jd_resume", "calculate_ats_analysis", "run_analysis"]
+DEFAULT_TARGETS = TARGETS[:4]
+
+STUB_LLM_RESPONSE = json.dumps({
+    "predicted_roles": [{"role": "Backend Engineer", "score": 0.8, "matched_skills": ["python"]}],
+    "skill_levels": [{"skill": "python", "level": "Advanced"}],
+    "booster_suggestions": [{"skill": "kafka", "snippet": "Built a Kafka consumer.", "derived_from_resume": False}],
+    "learning_path": [{"step": 1, "title": "Kafka basics", "duration_weeks": 2, "type": "course", "notes": ""}],
+    "future_trends": [{"name": "Platform engineering", "why": "Growing demand"}],
+})
+
+
+def install_stubs() -> None:
+    """Gemini answers instantly with a fixed payload; 'PDF' bytes are the resume text itself."""
+    generator.get_raw_llm_response = lambda prompt, timeout=None: STUB_LLM_RESPONSE
+
+    def extract_stub(pdf_bytes: bytes, filename: str = "resume.pdf", backends=None):
+        return {"text": pdf_bytes.decode("utf-8"), "backend": "stub", "elapsed_ms": 0.0, "cached": False, "attempts": []}
+    pipeline.extract_pdf = extract_stub
+
+
+def build_calls(target: str, items: List[Dict]) -> List[Callable[[], object]]:
+    """One zero-arg callable per corpus item; any per-item setup happens here, outside the timed region."""
+    if target == "extract_tech_keywords":
+        return [lambda r=it["resume"]: extract_tech_keywords(r) for it in items]
+    if target == "check_presence":
+        calls = []
+        for it in items:
+            profile = build_jd_profile(it["jd"])
+            keywords = profile["jd_tech_flat"] + profile["jd_phrases"]
+            calls.append(lambda k=keywords, r=it["resume"]: check_presence(k, r))
+        return calls
+    if target == "evaluate_jd_resume":
+        return [lambda j=it["jd"], r=it["resume"]: evaluate_jd_resume(j, r) for it in items]
+    if target == "calculate_ats_analysis":
+        return [lambda r=it["resume"], j=it["jd"]: calculate_ats_analysis(r, j) for it in items]
+    if target == "run_analysis":
+        return [lambda r=it["resume"], j=it["jd"]: asyncio.run(pipeline.run_analysis(r.encode("utf-8"), "bench.pdf", j))
+                for it in items]
+    raise ValueError(f"Unknown target: {target}")
+
+
+def bench_target(target: str, items: List[Dict], repeat: int, warmup: int) -> Dict:
+    calls = build_calls(target, items)
+    for call in calls[:warmup]:
+        call()
+
+    latencies = []
+    t_start = time.perf_counter()
+    for _ in range(repeat):
+        for call in calls:
+            t0 = time.perf_counter()
+            call()
+            latencies.append((time.perf_counter() - t0) * 1000)
+    wall = time.perf_counter() - t_start
+
+    # Separate pass: tracemalloc slows allocation-heavy code, so it never overlaps the timed runs
+    tracemalloc.start()
+    for call in calls:
+        call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "calls": len(latencies),
+        **latency_summary(latencies),
+        "throughput_per_s": round(len(latencies) / wall, 2) if wall else 0.0,
+        "peak_mem_mb": round(peak / (1024 * 1024), 3),
+    }
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5).stdout.strip()
+    except Exception:
+        return ""
+
+def run(n: int, seed: int, repeat: int, warmup: int, targets: List[str]) -> Dict:
+    install_stubs()
+    items = generate_corpus(n, seed)
+    t0 = time.perf_counter()
+    ai_loader.load()
+    load_s = time.perf_counter() - t0
+
+    results = {}
+    for target in targets:
+        print(f"benchmarking {target}...", file=sys.stderr)
+        results[target] = bench_target(target, items, repeat, warmup)
+    return {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "model": SBERT_MODEL_NAME,
+            "embedding_backend": EMBEDDING_BACKEND,
+            "model_load_s": round(load_s, 3),
+            "corpus": {"n": n, "seed": seed},
+            "repeat": repeat,
+            "warmup": warmup,
+            "llm_rate_limit": "off",
+        },
+        "results": results,
+    }
+
+
+def _delta(new: float, old: float) -> float:
+    return round((new - old) / old * 100, 1) if old else 0.0
+
+def compare(current: Dict, baseline: Dict, max_regression: float) -> bool:
+    """Print per-target deltas; True if every p95 is within `max_regression` percent of the baseline."""
+    if current["meta"]["corpus"] != baseline["meta"]["corpus"]:
+        print(f"warning: corpus differs from baseline ({baseline['meta']['corpus']})", file=sys.stderr)
+    ok = True
+    print(f"{'target':<24}{'p50 ms':>18}{'p95 ms':>18}{'calls/s':>18}")
+    for target, cur in current["results"].items():
+        base = baseline["results"].get(target)
+        if base is None:
+            print(f"{target:<24}{'(no baseline)':>18}")
+            continue
+        d50, d95 = _delta(cur["p50_ms"], base["p50_ms"]), _delta(cur["p95_ms"], base["p95_ms"])
+        dtp = _delta(cur["throughput_per_s"], base["throughput_per_s"])
+        flag = ""
+        if d95 > max_regression:
+            ok, flag = False, "  REGRESSION"
+        print(f"{target:<24}{cur['p50_ms']:>10} ({d50:+.1f}%){cur['p95_ms']:>10} ({d95:+.1f}%)"
+              f"{cur['throughput_per_s']:>10} ({dtp:+.1f}%){flag}")
+    return ok
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--n", type=int, default=30, help="resume/JD pairs in the synthetic corpus")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--repeat", type=int, default=3, help="timed passes over the corpus per target")
+    ap.add_argument("--warmup", type=int, default=3, help="untimed calls per target before measuring")
+    ap.add_argument("--targets", nargs="+", choices=TARGETS, default=DEFAULT_TARGETS)
+    ap.add_argument("--out", help="write results as JSON to this path")
+    ap.add_argument("--compare", help="baseline JSON from a previous run")
+    ap.add_argument("--max-regression", type=float, default=10.0, help="allowed p95 increase in percent")
+    args = ap.parse_args()
+
+    current = run(args.n, args.seed, args.repeat, args.warmup, args.targets)
+    print(json.dumps(current, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if not compare(current, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
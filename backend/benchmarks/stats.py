@@ -0,0 +1,26 @@
+# backend/benchmarks/stats.py
+"""Small latency summary helpers shared by the benchmark scripts."""
+
+from typing import Dict, List
+
+
+def percentile(sorted_vals: List[float], q: float) -> float:
+    """Linear interpolation between closest ranks (same as numpy's default)."""
+    if not sorted_vals: return 0.0
+    pos = (len(sorted_vals) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo)
+
+def latency_summary(latencies_ms: List[float]) -> Dict[str, float]:
+    vals = sorted(latencies_ms)
+    if not vals:
+        return {"p50_ms": 0.0, "p90_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0, "max_ms": 0.0}
+    return {
+        "p50_ms": round(percentile(vals, 50), 3),
+        "p90_ms": round(percentile(vals, 90), 3),
+        "p95_ms": round(percentile(vals, 95), 3),
+        "p99_ms": round(percentile(vals, 99), 3),
+        "mean_ms": round(sum(vals) / len(vals), 3),
+        "max_ms": round(vals[-1], 3),
+    }